@@ -0,0 +1,178 @@
+# benchmarks/pipeline.py
+# Times every step of the wiring pipeline on seeded synthetic projects of growing size and
+# writes the results as JSON, to compare versions:
+#   python -m benchmarks.pipeline                              (10 .. 100k symbols)
+#   python -m benchmarks.pipeline --sizes 10 1000 --mode graph --compare output/benchmarks/old.json
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.synthetic import project_of_size
+from config import ROUTING
+from engine import (assign_rooms, build_grid, calculate_cost, create_wiring, make_container,
+                    write_bom_latex, write_manufacturing_instructions_latex)
+
+SIZES = [10, 100, 1000, 10000, 100000]
+NOISE_FLOOR = 0.01  # seconds; faster steps are never reported as regressions
+STEPS = ["hanan_grid", "assign_rooms", "create_wiring", "calculate_cost", "bom_latex", "instructions_latex"]
+
+
+def run_pipeline(project, routing, threshold, output_dir):
+    """
+    Runs the pipeline once on project, timing each step
+
+    Returns:
+        timings({str: float}): seconds per step, in STEPS order
+        stats(dict): symbol, room and wire counts and the grand total
+    """
+    container = make_container(project["symbols"], project["scale"], project["rooms"], routing)
+    container['snap_threshold'] = threshold
+    timings = {}
+
+    def timed(step, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        timings[step] = time.perf_counter() - start
+        return result
+
+    timed("hanan_grid", build_grid, container)
+    timed("assign_rooms", assign_rooms, container)
+    wiring = timed("create_wiring", create_wiring, container)  # no route cache: always routes
+    grand_total, table_rows = timed("calculate_cost", calculate_cost, wiring.paths_by_room,
+                                    wiring.panel_max_amp, container['unit_prices'])
+    timed("bom_latex", write_bom_latex, os.path.join(output_dir, "bill_of_materials.tex"), grand_total, table_rows)
+    timed("instructions_latex", write_manufacturing_instructions_latex,
+          os.path.join(output_dir, "manufacturing_instructions.tex"), wiring.paths_by_room)
+
+    stats = {
+        "symbols": len(container['symbols']),
+        "rooms": len(container['rooms']),
+        "grid_nodes": len(container['grid']),
+        "wires": len(wiring.wires()),
+        "total": round(grand_total, 2),
+    }
+    return timings, stats
+
+
+def run_benchmarks(sizes=SIZES, repeat=1, seed=0, devices_per_room=40, routing=None, threshold=10):
+    """
+    Benchmarks every size; with repeat > 1 each step keeps its best time
+
+    Returns:
+        report(dict): environment, options and one {"size", "timings", ...} entry per size
+    """
+    routing = dict(routing or ROUTING)
+    results = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        # Warm-up, so lazy imports (matplotlib for room assignment) are not timed in the first size
+        run_pipeline(project_of_size(10, seed=seed), routing, threshold, output_dir)
+        for size in sizes:
+            best = {}
+            for _ in range(repeat):
+                # The pipeline snaps the symbols in place, so every run gets a fresh project
+                start = time.perf_counter()
+                project = project_of_size(size, devices_per_room=devices_per_room, seed=seed)
+                generate = time.perf_counter() - start
+                timings, stats = run_pipeline(project, routing, threshold, output_dir)
+                for step, seconds in timings.items():
+                    best[step] = min(best.get(step, seconds), seconds)
+            best["total"] = sum(best[step] for step in STEPS)
+            results.append(dict(size=size, generate=generate, timings=best, **stats))
+            print(f"⏱️ {stats['symbols']:>7} symbols, {stats['wires']:>7} wires: "
+                  + ", ".join(f"{step} {best[step]:.3f}s" for step in STEPS))
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "seed": seed,
+        "devices_per_room": devices_per_room,
+        "snap_threshold": threshold,
+        "routing": {key: routing[key] for key in ("mode", "topology", "workers")},
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance=1.2):
+    """
+    Step times of report against a baseline report, for the sizes both contain
+
+    Returns:
+        regressions([str]): steps slower than baseline by more than tolerance
+    """
+    old = {entry["size"]: entry["timings"] for entry in baseline["results"]}
+    regressions = []
+    print(f"Compared with {baseline.get('commit') or 'baseline'} ({baseline.get('timestamp')}):")
+    for entry in report["results"]:
+        if entry["size"] not in old:
+            continue
+        ratios = []
+        for step in STEPS + ["total"]:
+            before, after = old[entry["size"]].get(step), entry["timings"][step]
+            if not before:
+                continue
+            ratio = after / before
+            ratios.append(f"{step} x{ratio:.2f}")
+            # Steps under 10 ms are mostly timer and scheduling noise
+            if ratio > tolerance and after > NOISE_FLOOR:
+                regressions.append(f"{entry['size']} symbols: {step} {before:.3f}s -> {after:.3f}s")
+        print(f"   {entry['size']:>7}: " + ", ".join(ratios))
+    return regressions
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the wiring pipeline on synthetic projects.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="symbol counts to benchmark")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per size; the best time of each step is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--devices-per-room", type=int, default=40)
+    parser.add_argument("--threshold", type=float, default=10, help="snap threshold passed to the Hanan grid")
+    parser.add_argument("--mode", choices=["graph", "direct"], default="direct",
+                        help="routing mode; 'graph' builds a search tree over the whole grid per room, "
+                             "so keep its sizes small")
+    parser.add_argument("--topology", choices=["star", "steiner"], default=ROUTING['topology'])
+    parser.add_argument("-o", "--output", default=None, help="results JSON (default output/benchmarks/benchmark_<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="baseline results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.2, help="slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    routing = dict(ROUTING, mode=args.mode, topology=args.topology, workers=0)
+    report = run_benchmarks(args.sizes, args.repeat, args.seed, args.devices_per_room, routing, args.threshold)
+
+    output = args.output or os.path.join("output", "benchmarks",
+                                         f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {os.path.abspath(output)}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"❌ {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
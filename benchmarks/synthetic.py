@@ -0,0 +1,76 @@
+import math
+import random
+
+from classes.symbol import Symbol
+from classes.symbol_registry import SymbolRegistry
+from config import DEFAULTS
+
+
+def synthetic_project(rooms, devices_per_room, seed=0, room_size=400, pitch=20, scale=0.05):
+    """
+    Seeded synthetic floor plan: square rooms on a grid, each with one junction
+    box in the middle and devices_per_room devices (outlets, and switches
+    followed by the 1-3 lights they control), plus one electrical panel outside
+    the rooms. Devices sit on a pitch-pixel lattice, so the Hanan grid stays
+    a realistic size as the project grows.
+
+    Args:
+        rooms(int): number of rooms
+        devices_per_room(int): devices per room, lights included, junction box excluded
+        seed(int): random seed; the same arguments always give the same project
+        room_size(int): room side in pixels
+        pitch(int): spacing of the lattice devices are placed on
+        scale(float): ft/pixel scale of the plan
+    Returns:
+        project(dict): {"symbols", "scale", "rooms"} as load_project returns them
+    """
+    rng = random.Random(seed)
+    columns = math.ceil(math.sqrt(rooms))
+    cells = room_size // pitch
+    origin = 2 * pitch
+
+    def make(symbol_type, coords, n):
+        defaults = DEFAULTS[symbol_type]
+        return Symbol(symbol_type, coords, None, defaults['amperage'], defaults['height'], id=f"{n:06x}")
+
+    symbols = []
+    outlines = []
+    for r in range(rooms):
+        ox = origin + (r % columns) * room_size
+        oy = origin + (r // columns) * room_size
+        outlines.append(([(ox, oy), (ox + room_size, oy), (ox + room_size, oy + room_size), (ox, oy + room_size)],
+                         f"ROOM{r + 1}"))
+        symbols.append(make("junction box", (ox + room_size // 2, oy + room_size // 2), len(symbols)))
+
+        def spot():
+            return (ox + pitch * rng.randint(1, cells - 1), oy + pitch * rng.randint(1, cells - 1))
+
+        placed = 0
+        while placed < devices_per_room:
+            if devices_per_room - placed >= 2 and rng.random() < 0.3:
+                switch = make("switch", spot(), len(symbols))
+                symbols.append(switch)
+                for _ in range(min(rng.randint(1, 3), devices_per_room - placed - 1)):
+                    light = make("light", spot(), len(symbols))
+                    switch.controls.append(light)
+                    symbols.append(light)
+                placed += 1 + len(switch.controls)
+            else:
+                symbols.append(make("outlet", spot(), len(symbols)))
+                placed += 1
+
+    symbols.append(make("electrical panel", (pitch, pitch), len(symbols)))
+    return {"symbols": SymbolRegistry(symbols), "scale": scale, "rooms": outlines}
+
+
+def project_of_size(symbols, devices_per_room=40, seed=0, **kwargs):
+    """
+    synthetic_project with about symbols symbols in total
+
+    Args:
+        symbols(int): target symbol count (at least 3)
+        devices_per_room(int): devices per room for large projects; small ones use a single room
+    """
+    rooms = max(1, (symbols - 1) // (devices_per_room + 1))
+    per_room = max(1, (symbols - 1) // rooms - 1)
+    return synthetic_project(rooms, per_room, seed=seed, **kwargs)
@@ -0,0 +1,173 @@
+import numpy as np
+
+
+class HananGrid:
+    def __init__(self, x_coords, y_coords, dots=()):
+        """
+        Implicit Hanan grid: only the sorted axes and an is_dot bitmap are stored.
+
+        Nodes are (x, y) pixel tuples. Neighbours and edge lengths are derived
+        from the axis indices, so no per-node or per-edge objects are created.
+
+        Class parameters:
+        x_coords, y_coords, is_dot, blocked
+        """
+        self.x_coords = np.asarray(x_coords, dtype=np.int64)
+        self.y_coords = np.asarray(y_coords, dtype=np.int64)
+        self.is_dot = np.zeros((len(self.x_coords), len(self.y_coords)), dtype=bool)
+        for node in dots:
+            self.is_dot[self.index_of(node)] = True
+        # Blocked edges as (smaller flat index, larger flat index) pairs
+        self.blocked = set()
+
+    @property
+    def has_obstacles(self):
+        return bool(self.blocked)
+
+    def block_edge(self, u, v):
+        """
+        Removes the grid edge between two adjacent nodes (e.g. a wall crossing).
+
+        Raises:
+            KeyError: if u and v are not adjacent on the grid
+        """
+        self.edge_length(u, v)
+        a, b = self.flat_index(u), self.flat_index(v)
+        self.blocked.add((min(a, b), max(a, b)))
+
+    def add_node(self, node, is_dot=True):
+        """
+        Extends the grid incrementally so that it contains node, inserting its
+        x and/or y axis when missing instead of rebuilding the whole grid.
+        Blocked edges split by a new axis stay blocked on both halves.
+        """
+        x, y = node
+        blocked_nodes = [(self.node_from_flat(a), self.node_from_flat(b)) for a, b in self.blocked]
+        i = int(np.searchsorted(self.x_coords, x))
+        if i == len(self.x_coords) or self.x_coords[i] != x:
+            self.x_coords = np.insert(self.x_coords, i, x)
+            self.is_dot = np.insert(self.is_dot, i, False, axis=0)
+        j = int(np.searchsorted(self.y_coords, y))
+        if j == len(self.y_coords) or self.y_coords[j] != y:
+            self.y_coords = np.insert(self.y_coords, j, y)
+            self.is_dot = np.insert(self.is_dot, j, False, axis=1)
+        if is_dot:
+            self.is_dot[i, j] = True
+
+        # Flat indices shift when an axis is inserted, so re-block by node
+        self.blocked = set()
+        for u, v in blocked_nodes:
+            (i1, j1), (i2, j2) = self.index_of(u), self.index_of(v)
+            if i1 == i2:
+                steps = [((i1, b), (i1, b + 1)) for b in range(min(j1, j2), max(j1, j2))]
+            else:
+                steps = [((a, j1), (a + 1, j1)) for a in range(min(i1, i2), max(i1, i2))]
+            for a, b in steps:
+                self.block_edge(self.node_at(*a), self.node_at(*b))
+
+    def set_dot(self, node, is_dot):
+        self.is_dot[self.index_of(node)] = is_dot
+
+    @property
+    def shape(self):
+        return len(self.x_coords), len(self.y_coords)
+
+    def __len__(self):
+        return len(self.x_coords) * len(self.y_coords)
+
+    def __contains__(self, node):
+        try:
+            self.index_of(node)
+        except KeyError:
+            return False
+        return True
+
+    def index_of(self, node):
+        """
+        Returns the (i, j) axis indices of a grid node.
+
+        Raises:
+            KeyError: if the node does not lie on the grid
+        """
+        x, y = node
+        i = int(np.searchsorted(self.x_coords, x))
+        j = int(np.searchsorted(self.y_coords, y))
+        if i >= len(self.x_coords) or j >= len(self.y_coords) \
+                or self.x_coords[i] != x or self.y_coords[j] != y:
+            raise KeyError(node)
+        return i, j
+
+    def nearest_node(self, x, y):
+        """Closest grid node to an arbitrary point, by binary search on each sorted axis."""
+        def nearest(axis, value):
+            k = int(np.searchsorted(axis, value))
+            if k == len(axis) or (k > 0 and value - axis[k - 1] <= axis[k] - value):
+                k -= 1
+            return k
+        return self.node_at(nearest(self.x_coords, x), nearest(self.y_coords, y))
+
+    def node_at(self, i, j):
+        return int(self.x_coords[i]), int(self.y_coords[j])
+
+    def flat_index(self, node):
+        """Returns the node's position in column-major (i * n_y + j) order."""
+        i, j = self.index_of(node)
+        return i * len(self.y_coords) + j
+
+    def node_from_flat(self, k):
+        return self.node_at(*divmod(int(k), len(self.y_coords)))
+
+    def flat_neighbors(self, k):
+        """Flat indices of the grid neighbours of flat node k."""
+        for n, _ in self.flat_edges(k):
+            yield n
+
+    def flat_edges(self, k):
+        """(flat index, pixel length) of every unblocked grid edge leaving flat node k."""
+        n_x, n_y = self.shape
+        i, j = divmod(k, n_y)
+        edges = []
+        if i > 0:
+            edges.append((k - n_y, int(self.x_coords[i] - self.x_coords[i - 1])))
+        if i < n_x - 1:
+            edges.append((k + n_y, int(self.x_coords[i + 1] - self.x_coords[i])))
+        if j > 0:
+            edges.append((k - 1, int(self.y_coords[j] - self.y_coords[j - 1])))
+        if j < n_y - 1:
+            edges.append((k + 1, int(self.y_coords[j + 1] - self.y_coords[j])))
+        if self.blocked:
+            edges = [(n, length) for n, length in edges if (min(k, n), max(k, n)) not in self.blocked]
+        return edges
+
+    def nodes(self):
+        """Iterates over every grid node, column by column."""
+        ys = [int(y) for y in self.y_coords]
+        for x in self.x_coords:
+            x = int(x)
+            for y in ys:
+                yield (x, y)
+
+    def dots(self):
+        """Iterates over the nodes that hold an annotated symbol."""
+        for i, j in zip(*np.nonzero(self.is_dot)):
+            yield self.node_at(i, j)
+
+    def dot_coords(self):
+        """(N, 2) array of the dot nodes' coordinates, in the same order as dots()."""
+        i, j = np.nonzero(self.is_dot)
+        return np.column_stack((self.x_coords[i], self.y_coords[j]))
+
+    def node_is_dot(self, node):
+        return bool(self.is_dot[self.index_of(node)])
+
+    def edge_length(self, u, v):
+        """
+        Pixel length of the grid edge between two adjacent nodes.
+
+        Raises:
+            KeyError: if u and v are not adjacent on the grid
+        """
+        (i1, j1), (i2, j2) = self.index_of(u), self.index_of(v)
+        if abs(i1 - i2) + abs(j1 - j2) != 1:
+            raise KeyError((u, v))
+        return abs(u[0] - v[0]) + abs(u[1] - v[1])
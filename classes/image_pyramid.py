@@ -0,0 +1,122 @@
+import hashlib
+import json
+import math
+import os
+import shutil
+from collections import OrderedDict
+
+from PIL import Image
+
+from utils.image_utils import decode_image
+
+
+class ImagePyramid:
+    def __init__(self, image_path, directory, tile_size=512, image=None, max_cached_tiles=256):
+        """
+        Multi-resolution tiled copy of a floor plan, built once and kept on disk
+        under directory/<key>/. Level 0 is full resolution and every further
+        level halves the previous one until it fits a single tile. Tiles are
+        read back on demand and the most recently used ones are kept in memory.
+
+        image can pass an already decoded copy of the plan (or a callable
+        returning one) so building the pyramid does not decode the file again.
+
+        Class parameters:
+        image_path, directory, tile_size, width, height, levels
+        """
+        self.image_path = image_path
+        self.tile_size = tile_size
+        self.max_cached_tiles = max_cached_tiles
+        self.directory = os.path.join(directory, self.cache_key(image_path, tile_size))
+        self._tiles = OrderedDict()
+
+        manifest = self._read_manifest()
+        if manifest is None:
+            self.build(image)
+            manifest = self._read_manifest()
+        self.width = manifest["width"]
+        self.height = manifest["height"]
+        self.levels = manifest["levels"]
+
+    @staticmethod
+    def cache_key(image_path, tile_size):
+        """Identifies the plan by path, size and modification time, without reading it"""
+        stat = os.stat(image_path)
+        content = f"{os.path.abspath(image_path)}|{stat.st_size}|{stat.st_mtime_ns}|{tile_size}"
+        return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+    def _read_manifest(self):
+        try:
+            with open(os.path.join(self.directory, "manifest.json"), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def build(self, image=None):
+        """Cuts every level into tiles; written to a temp directory and moved into place when complete"""
+        if image is None:
+            image = decode_image(self.image_path)
+        elif callable(image):
+            image = image()
+        image = image.convert("RGB")
+        width, height = image.size
+
+        tmp = self.directory + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        level = 0
+        while True:
+            os.makedirs(os.path.join(tmp, str(level)))
+            for row in range(math.ceil(image.height / self.tile_size)):
+                for col in range(math.ceil(image.width / self.tile_size)):
+                    box = (col * self.tile_size, row * self.tile_size,
+                           min((col + 1) * self.tile_size, image.width),
+                           min((row + 1) * self.tile_size, image.height))
+                    image.crop(box).save(os.path.join(tmp, str(level), f"{col}_{row}.png"), compress_level=1)
+            if max(image.size) <= self.tile_size:
+                break
+            image = image.reduce(2)
+            level += 1
+
+        with open(os.path.join(tmp, "manifest.json"), "w") as f:
+            json.dump({"width": width, "height": height, "levels": level + 1, "tile_size": self.tile_size}, f)
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.replace(tmp, self.directory)
+        print(f"🧱 Built {level + 1}-level tile pyramid for {os.path.basename(self.image_path)}")
+
+    def level_for(self, zoom):
+        """Coarsest level that still has at least one pixel per screen pixel at zoom"""
+        if zoom >= 1:
+            return 0
+        return min(int(math.floor(math.log2(1 / zoom))), self.levels - 1)
+
+    def tiles_in(self, level, bbox):
+        """
+        Args:
+            level(int): pyramid level
+            bbox((float,float,float,float)): x0, y0, x1, y1 region in full resolution pixels
+        Returns:
+            tiles([(int,int,int)]): (level, col, row) of every tile overlapping bbox
+        """
+        span = self.tile_size * 2**level
+        x0, y0, x1, y1 = bbox
+        cols = range(max(0, int(x0 // span)), min(math.ceil(self.width / span), int(x1 // span) + 1))
+        rows = range(max(0, int(y0 // span)), min(math.ceil(self.height / span), int(y1 // span) + 1))
+        return [(level, col, row) for row in rows for col in cols]
+
+    def tile_box(self, level, col, row):
+        """Region a tile covers, in full resolution pixels"""
+        span = self.tile_size * 2**level
+        return (col * span, row * span,
+                min((col + 1) * span, self.width), min((row + 1) * span, self.height))
+
+    def tile(self, level, col, row):
+        key = (level, col, row)
+        if key in self._tiles:
+            self._tiles.move_to_end(key)
+            return self._tiles[key]
+        with Image.open(os.path.join(self.directory, str(level), f"{col}_{row}.png")) as f:
+            tile = f.copy()
+        self._tiles[key] = tile
+        if len(self._tiles) > self.max_cached_tiles:
+            self._tiles.popitem(last=False)
+        return tile
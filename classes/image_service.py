@@ -0,0 +1,37 @@
+import os
+
+from classes.image_pyramid import ImagePyramid
+from utils.image_utils import decode_image
+
+
+class ImageService:
+    def __init__(self, image_path, tiles):
+        """
+        The floor plan shared by every stage through container['image']. The
+        file is decoded at most once, on first use, into one image that every
+        consumer shares; nothing may draw on it in place (render_layout works
+        on a copy). The tile pyramid is created from that one buffer on
+        demand, so moving between stages does no image I/O.
+
+        Class parameters:
+        image_path, image_name, tiles
+        """
+        self.image_path = image_path
+        self.image_name = os.path.basename(image_path).split('.')[0]
+        self.tiles = tiles
+        self._image = None
+        self._pyramid = None
+
+    @property
+    def image(self):
+        """Decoded plan (PIL.Image), shared by every stage; treat as read-only"""
+        if self._image is None:
+            self._image = decode_image(self.image_path)
+        return self._image
+
+    def pyramid(self):
+        """Tile pyramid of the plan, built from the decoded image the first time"""
+        if self._pyramid is None:
+            self._pyramid = ImagePyramid(self.image_path, self.tiles['directory'], self.tiles['tile_size'],
+                                         image=lambda: self.image)
+        return self._pyramid
@@ -0,0 +1,154 @@
+import tkinter as tk
+
+from PIL import ImageTk
+
+
+class PlanCanvas(tk.Canvas):
+    ZOOM_STEP = 1.25
+    MIN_ZOOM = 1 / 64
+    MAX_ZOOM = 8
+
+    def __init__(self, master, **kwargs):
+        """
+        Canvas that shows a floor plan from an ImagePyramid and supports zoom
+        (Ctrl + mouse wheel) and pan (scrollbars or middle-button drag).
+
+        Items are created in plan pixel coordinates and placed at the current
+        zoom, so the stages keep drawing exactly as before. canvasx/canvasy stay
+        Tk's raw canvas coordinates; use plan_coords to map an event back onto
+        the plan. Only the background tiles covering the visible area, at the
+        pyramid level matching the zoom, are loaded as images.
+
+        Class parameters:
+        zoom, pyramid
+        """
+        super().__init__(master, **kwargs)
+        self.zoom = 1.0
+        self.pyramid = None
+        self._tiles = {}  # (level, col, row) -> (item, PhotoImage)
+        self._listeners = []
+        self._view_job = None
+
+        self.bind("<Control-MouseWheel>", lambda e: self.zoom_by(self.ZOOM_STEP if e.delta > 0 else 1 / self.ZOOM_STEP, e.x, e.y))
+        self.bind("<Control-Button-4>", lambda e: self.zoom_by(self.ZOOM_STEP, e.x, e.y))
+        self.bind("<Control-Button-5>", lambda e: self.zoom_by(1 / self.ZOOM_STEP, e.x, e.y))
+        self.bind("<ButtonPress-2>", lambda e: self.scan_mark(e.x, e.y))
+        self.bind("<B2-Motion>", lambda e: self.scan_dragto(e.x, e.y, gain=1))
+        self.bind("<Configure>", lambda e: self.view_changed(), add="+")
+
+    # === Plan coordinates ===
+
+    def _create(self, itemType, args, kw):
+        args = tk._flatten(args)
+        cnf = args[-1] if args and isinstance(args[-1], dict) else None
+        coords = args[:-1] if cnf is not None else args
+        if self.zoom != 1.0:
+            coords = tuple(c * self.zoom for c in coords)
+        return super()._create(itemType, coords + ((cnf,) if cnf is not None else ()), kw)
+
+    def create_overlay(self, x, y, image, tags=()):
+        """Image item at raw canvas coordinates (not scaled by the zoom)"""
+        return super()._create("image", (x, y), {"anchor": "nw", "image": image, "tags": tags})
+
+    def plan_coords(self, x, y):
+        """Plan pixel coordinates under the widget position (x, y), e.g. an event's"""
+        return self.canvasx(x) / self.zoom, self.canvasy(y) / self.zoom
+
+    def viewport(self):
+        """Visible region in raw canvas coordinates"""
+        x0, y0 = self.canvasx(0), self.canvasy(0)
+        return x0, y0, x0 + self.winfo_width(), y0 + self.winfo_height()
+
+    # === Background ===
+
+    def set_background(self, pyramid):
+        for item, _ in self._tiles.values():
+            self.delete(item)
+        self._tiles.clear()
+        self.pyramid = pyramid
+        self.update_scrollregion()
+        self.view_changed()
+
+    def update_scrollregion(self):
+        if self.pyramid is not None:
+            self.configure(scrollregion=(0, 0, self.pyramid.width * self.zoom, self.pyramid.height * self.zoom))
+        else:
+            self.configure(scrollregion=self.bbox("all"))
+
+    def refresh_tiles(self):
+        """Shows the tiles covering the viewport at the current zoom and drops the rest"""
+        if self.pyramid is None:
+            return
+        z = self.zoom
+        level = self.pyramid.level_for(z)
+        x0, y0, x1, y1 = self.viewport()
+        wanted = set(self.pyramid.tiles_in(level, (x0 / z, y0 / z, x1 / z, y1 / z)))
+
+        for key in [k for k in self._tiles if k not in wanted]:
+            self.delete(self._tiles.pop(key)[0])
+        for key in wanted:
+            if key in self._tiles:
+                continue
+            left, top, right, bottom = self.pyramid.tile_box(*key)
+            sx, sy = round(left * z), round(top * z)
+            size = (max(1, round(right * z) - sx), max(1, round(bottom * z) - sy))
+            tile = self.pyramid.tile(*key)
+            if tile.size != size:
+                tile = tile.resize(size)
+            photo = ImageTk.PhotoImage(tile)
+            self._tiles[key] = (self.create_overlay(sx, sy, photo, tags=("background",)), photo)
+        self.tag_lower("background")
+
+    # === Zoom and pan ===
+
+    def zoom_by(self, factor, x=0, y=0):
+        self.set_zoom(self.zoom * factor, x, y)
+
+    def set_zoom(self, zoom, x=0, y=0):
+        """Zooms to zoom keeping the plan point under widget position (x, y) in place"""
+        zoom = min(max(zoom, self.MIN_ZOOM), self.MAX_ZOOM)
+        if zoom == self.zoom:
+            return
+        px, py = self.plan_coords(x, y)
+        for item, _ in self._tiles.values():
+            self.delete(item)
+        self._tiles.clear()
+        self.scale("all", 0, 0, zoom / self.zoom, zoom / self.zoom)
+        self.zoom = zoom
+        self.update_scrollregion()
+        if self.pyramid is not None:
+            super().xview_moveto((px * zoom - x) / (self.pyramid.width * zoom))
+            super().yview_moveto((py * zoom - y) / (self.pyramid.height * zoom))
+        self.view_changed()
+
+    def xview(self, *args):
+        result = super().xview(*args)
+        if args:
+            self.view_changed()
+        return result
+
+    def yview(self, *args):
+        result = super().yview(*args)
+        if args:
+            self.view_changed()
+        return result
+
+    def scan_dragto(self, x, y, gain=10):
+        super().scan_dragto(x, y, gain)
+        self.view_changed()
+
+    def on_view_change(self, callback):
+        """Calls callback after the visible area changes (scroll, pan, zoom, resize)"""
+        self._listeners.append(callback)
+
+    def view_changed(self):
+        # Coalesce bursts of scroll/drag events into one refresh
+        if self._view_job is not None:
+            self.after_cancel(self._view_job)
+        self._view_job = self.after(30, self._refresh_view)
+
+    def _refresh_view(self):
+        self._view_job = None
+        self.refresh_tiles()
+        for callback in self._listeners:
+            callback()
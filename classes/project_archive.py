@@ -0,0 +1,264 @@
+import json
+import math
+import os
+import struct
+
+import numpy as np
+
+from classes.hanan_grid import HananGrid
+from classes.symbol import Symbol
+from classes.symbol_registry import SymbolRegistry
+from classes.wire_table import WireTable
+
+MAGIC = b"EWDP"
+VERSION = 1
+ALIGN = 64
+# magic, format version, header length
+PREAMBLE = struct.Struct("<4sIQ")
+
+
+def _aligned(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _optional(values):
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def _scalar(value):
+    """Back from an _optional column: None for NaN, int when integral (as saved from JSON)"""
+    value = float(value)
+    if math.isnan(value):
+        return None
+    return int(value) if value.is_integer() else value
+
+
+class ProjectArchive:
+    EXTENSION = ".ewdp"
+
+    def __init__(self, path):
+        """
+        Versioned binary project file: a JSON header followed by raw, 64-byte
+        aligned numpy arrays (symbol columns, room outlines, the Hanan grid axes
+        and is_dot bitmap, and the routed wires packed into one coordinate
+        buffer). The file is memory-mapped and arrays are views into the
+        mapping, so opening an archive reads nothing until a column is used.
+
+        Class parameters:
+        path, header, arrays
+
+        Raises:
+            ValueError: if path is not a project archive or has a newer version
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            magic, version, header_len = PREAMBLE.unpack(f.read(PREAMBLE.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a project archive")
+            if version > VERSION:
+                raise ValueError(f"{path} has archive version {version}, this build reads up to {VERSION}")
+            self.header = json.loads(f.read(header_len))
+
+        data_start = _aligned(PREAMBLE.size + header_len)
+        buffer = np.memmap(path, dtype=np.uint8, mode="r") if os.path.getsize(path) > data_start else np.zeros(0, np.uint8)
+        self.arrays = {}
+        for name, spec in self.header["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            start = data_start + spec["offset"]
+            count = int(np.prod(spec["shape"], dtype=np.int64))
+            self.arrays[name] = buffer[start:start + count * dtype.itemsize].view(dtype).reshape(spec["shape"])
+
+    # === Writing ===
+
+    @staticmethod
+    def write(path, symbols, scale, rooms=(), grid=None, wiring=None):
+        """
+        Args:
+            path(str): output file
+            symbols([Symbol]): annotated symbols
+            scale(float): ft/pixel scale of the plan
+            rooms([([(int,int)], str)]): room outlines and names
+            grid(HananGrid): grid of the snapped symbols, if built
+            wiring(WiringModel): routed wiring, if built; its wires are stored with their paths
+        """
+        symbols = list(symbols)
+        index = {id(s): i for i, s in enumerate(symbols)}
+        types = sorted({s.type for s in symbols})
+        symbol_rooms = sorted({s.room for s in symbols if s.room is not None})
+        coords = np.array([s.coords for s in symbols], dtype=np.float64).reshape(-1, 2)
+
+        controls = [[index[id(c)] for c in s.controls if id(c) in index] if s.type == "switch" else [] for s in symbols]
+        arrays = {
+            "symbol_ids": np.array([str(s.id) for s in symbols], dtype=str),
+            "symbol_type": np.array([types.index(s.type) for s in symbols], dtype=np.int16),
+            "symbol_coords": coords.astype(np.int64) if np.array_equal(coords, np.round(coords)) else coords,
+            "symbol_room": np.array([-1 if s.room is None else symbol_rooms.index(s.room) for s in symbols], dtype=np.int32),
+            "symbol_amperage": _optional(s.amperage for s in symbols),
+            "symbol_height": _optional(s.height for s in symbols),
+            "control_offsets": np.cumsum([0] + [len(c) for c in controls], dtype=np.int64),
+            "control_index": np.array([i for c in controls for i in c], dtype=np.int32),
+            "room_offsets": np.cumsum([0] + [len(polygon) for polygon, _ in rooms], dtype=np.int64),
+            "room_points": np.array([p for polygon, _ in rooms for p in polygon], dtype=np.int64).reshape(-1, 2),
+        }
+        header = {
+            "version": VERSION,
+            "scale": scale,
+            "types": types,
+            "symbol_rooms": symbol_rooms,
+            "rooms": [name for _, name in rooms],
+        }
+
+        if grid is not None:
+            header["grid_shape"] = list(grid.is_dot.shape)
+            arrays["grid_x"] = grid.x_coords
+            arrays["grid_y"] = grid.y_coords
+            arrays["grid_is_dot"] = np.packbits(grid.is_dot, axis=None)
+            arrays["grid_blocked"] = np.array(sorted(grid.blocked), dtype=np.int64).reshape(-1, 2)
+
+        if wiring is not None:
+            wire_rooms = list(wiring.paths_by_room)
+            wires = [(k, wire) for k, room in enumerate(wire_rooms)
+                     for device_path in wiring.paths_by_room[room] for wire in device_path.values()]
+            paths = [wire.path for _, wire in wires]
+            header["routes"] = {
+                "routing": {key: wiring.routing[key] for key in ("mode", "topology")},
+                "rooms": wire_rooms,
+                "total_amp_by_room": wiring.total_amp_by_room,
+            }
+            arrays["wire_ids"] = np.array([wire.id for _, wire in wires], dtype=str)
+            arrays["wire_room"] = np.array([k for k, _ in wires], dtype=np.int32)
+            arrays["wire_start"] = np.array([index[id(wire.start_symbol)] for _, wire in wires], dtype=np.int32)
+            arrays["wire_end"] = np.array([index[id(wire.end_symbol)] for _, wire in wires], dtype=np.int32)
+            arrays["wire_amperage"] = np.array([wire.amperage for _, wire in wires], dtype=np.float64)
+            arrays["route_offsets"] = np.cumsum([0] + [len(p) for p in paths], dtype=np.int64)
+            arrays["route_coords"] = np.array([node for p in paths for node in p], dtype=np.int32).reshape(-1, 2)
+
+        offset = 0
+        header["arrays"] = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            arrays[name] = array
+            header["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset = _aligned(offset + array.nbytes)
+
+        encoded = json.dumps(header).encode()
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(PREAMBLE.pack(MAGIC, VERSION, len(encoded)))
+            f.write(encoded)
+            f.write(b"\0" * (_aligned(PREAMBLE.size + len(encoded)) - PREAMBLE.size - len(encoded)))
+            for name, array in arrays.items():
+                f.write(array.tobytes())
+                f.write(b"\0" * (_aligned(array.nbytes) - array.nbytes))
+        os.replace(tmp, path)
+
+    # === Reading ===
+
+    @property
+    def scale(self):
+        return self.header["scale"]
+
+    @property
+    def has_grid(self):
+        return "grid_shape" in self.header
+
+    @property
+    def has_routes(self):
+        return "routes" in self.header
+
+    def symbols(self, registry=None):
+        """Rebuilds the symbols, with switch controls linked, into registry (a new one if None)"""
+        a, h = self.arrays, self.header
+        coords = a["symbol_coords"].tolist()
+        symbols = [
+            Symbol(h["types"][t], tuple(xy), None if r < 0 else h["symbol_rooms"][r], _scalar(amps), _scalar(height), id=sid)
+            for sid, t, xy, r, amps, height in zip(a["symbol_ids"].tolist(), a["symbol_type"].tolist(), coords,
+                                                     a["symbol_room"].tolist(), a["symbol_amperage"], a["symbol_height"])
+        ]
+        offsets, control_index = a["control_offsets"].tolist(), a["control_index"].tolist()
+        for i, symbol in enumerate(symbols):
+            if offsets[i + 1] > offsets[i]:
+                symbol.controls = [symbols[k] for k in control_index[offsets[i]:offsets[i + 1]]]
+
+        if registry is None:
+            registry = SymbolRegistry()
+        registry.extend(symbols)
+        return registry
+
+    def rooms(self):
+        offsets, points = self.arrays["room_offsets"], self.arrays["room_points"].tolist()
+        return [([tuple(p) for p in points[offsets[k]:offsets[k + 1]]], name)
+                for k, name in enumerate(self.header["rooms"])]
+
+    def grid(self):
+        """The saved HananGrid (with its own writable arrays), or None"""
+        if not self.has_grid:
+            return None
+        grid = HananGrid(np.array(self.arrays["grid_x"]), np.array(self.arrays["grid_y"]))
+        shape = self.header["grid_shape"]
+        grid.is_dot = np.unpackbits(self.arrays["grid_is_dot"], count=shape[0] * shape[1]).reshape(shape).astype(bool)
+        grid.blocked = set(map(tuple, self.arrays["grid_blocked"].tolist()))
+        return grid
+
+    def routes(self, symbols, scale):
+        """
+        Saved wires rebuilt in one WireTable, without routing
+
+        Args:
+            symbols([Symbol]): symbols returned by symbols(), in saved order
+            scale(float): ft/pixel scale of the plan
+        Returns:
+            routes(dict): {"routing", "total_amp_by_room", "paths_by_room"}, or None if none were saved
+        """
+        if not self.has_routes:
+            return None
+        a, info = self.arrays, self.header["routes"]
+        symbols = list(symbols)
+        starts = [symbols[k] for k in a["wire_start"].tolist()]
+        ends = [symbols[k] for k in a["wire_end"].tolist()]
+        table = WireTable(starts, ends, a["route_coords"], a["route_offsets"], np.array(a["wire_amperage"]), scale)
+        table.ids = np.array(a["wire_ids"])
+
+        paths_by_room = {room: [] for room in info["rooms"]}
+        for row, k in enumerate(a["wire_room"].tolist()):
+            paths_by_room[info["rooms"][k]].append({starts[row]: table.wire(row)})
+        return {"routing": info["routing"], "total_amp_by_room": info["total_amp_by_room"],
+                "paths_by_room": paths_by_room}
+
+    def project(self, registry=None):
+        """Same {"symbols", "scale", "rooms", "grid"} as load_project, plus the saved "routes" (or None)"""
+        symbols = self.symbols(registry)
+        return {"symbols": symbols, "scale": self.scale, "rooms": self.rooms(), "grid": self.grid(),
+                "routes": self.routes(symbols, self.scale)}
+
+    def diff(self, other):
+        """
+        Symbol-level differences to another archive, from the id and coordinate
+        columns only (no symbols are built)
+
+        Returns:
+            diff(dict): ids "added" and "removed" in other, and "moved" / "changed"
+                (type, room, amperage or height) between the two
+        """
+        def columns(archive):
+            a, h = archive.arrays, archive.header
+            rooms = np.array([None] + h["symbol_rooms"], dtype=object)[a["symbol_room"] + 1]
+            types = np.array(h["types"], dtype=object)[a["symbol_type"]]
+            return {sid: k for k, sid in enumerate(a["symbol_ids"].tolist())}, a, types, rooms
+
+        mine, a, my_types, my_rooms = columns(self)
+        theirs, b, their_types, their_rooms = columns(other)
+        common = [sid for sid in mine if sid in theirs]
+        i = np.array([mine[sid] for sid in common], dtype=np.int64)
+        j = np.array([theirs[sid] for sid in common], dtype=np.int64)
+
+        moved = np.any(a["symbol_coords"][i] != b["symbol_coords"][j], axis=1) if len(common) else np.zeros(0, bool)
+        changed = ((my_types[i] != their_types[j]) | (my_rooms[i] != their_rooms[j])
+                   | ~np.isclose(a["symbol_amperage"][i], b["symbol_amperage"][j], equal_nan=True)
+                   | ~np.isclose(a["symbol_height"][i], b["symbol_height"][j], equal_nan=True)) if len(common) else moved
+        return {
+            "added": [sid for sid in theirs if sid not in mine],
+            "removed": [sid for sid in mine if sid not in theirs],
+            "moved": [sid for sid, m in zip(common, moved) if m],
+            "changed": [sid for sid, c in zip(common, changed) if c],
+        }
@@ -0,0 +1,191 @@
+import json
+import os
+import threading
+
+SNAPSHOT = "snapshot.json"
+JOURNAL = "journal.jsonl"
+
+
+class SessionJournal:
+    def __init__(self, directory, state, flush_interval=0.5, compact_every=500):
+        """
+        Append-only autosave of an annotation session. Every edit is recorded as
+        one small operation ("add", "move", "edit", "delete", "link", "scale",
+        "room") and queued; a background thread appends the queued operations to
+        journal.jsonl in batches every flush_interval seconds. After
+        compact_every operations the whole session, from state(), is written to
+        snapshot.json and the journal starts over, so replay stays short.
+
+        state is called on the recording (GUI) thread and returns the session as
+        a project dict ({"scale", "symbols", "rooms"}, see project_to_dict).
+
+        Class parameters:
+        directory, state, flush_interval, compact_every, seq
+        """
+        self.directory = directory
+        self.state = state
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+        os.makedirs(directory, exist_ok=True)
+
+        snapshot, ops = self.read(directory)
+        self.seq = max([snapshot.get("seq", 0)] + [op["seq"] for op in ops])
+        self._since_snapshot = len(ops)
+        # Drop a torn last write (and ops already in the snapshot) before appending again
+        with open(os.path.join(directory, JOURNAL), "w") as f:
+            self._flush(f, [json.dumps(op) for op in ops])
+        self._queue = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="session-journal", daemon=True)
+        self._thread.start()
+
+    # === Recording ===
+
+    def record(self, op, **fields):
+        """Queues one operation, e.g. record("move", id=symbol.id, coords=[x, y]); O(1)"""
+        self.seq += 1
+        entry = dict(fields, op=op, seq=self.seq)
+        with self._cond:
+            self._queue.append(("op", entry))
+            self._cond.notify()
+        self._since_snapshot += 1
+        if self._since_snapshot >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """Queues a snapshot of the whole session; the journal is truncated once it is written"""
+        snapshot = dict(self.state(), seq=self.seq)
+        with self._cond:
+            self._queue.append(("snapshot", snapshot))
+            self._cond.notify()
+        self._since_snapshot = 0
+
+    def close(self):
+        """Writes everything still queued and stops the writer thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        journal = open(os.path.join(self.directory, JOURNAL), "a")
+        try:
+            while True:
+                with self._cond:
+                    while not self._queue and not self._closed:
+                        self._cond.wait()
+                # Let edits made in quick succession land in the same write
+                self._stop.wait(self.flush_interval)
+                with self._cond:
+                    batch, self._queue = self._queue, []
+                    closed = self._closed
+                journal = self._write(journal, batch)
+                if closed:
+                    return
+        finally:
+            journal.close()
+
+    def _write(self, journal, batch):
+        lines = []
+        for kind, item in batch:
+            if kind == "op":
+                lines.append(json.dumps(item))
+                continue
+            # Ops queued before the snapshot are part of it
+            lines.clear()
+            tmp = os.path.join(self.directory, SNAPSHOT + ".tmp")
+            with open(tmp, "w") as f:
+                json.dump(item, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, os.path.join(self.directory, SNAPSHOT))
+            journal.close()
+            journal = open(os.path.join(self.directory, JOURNAL), "w")
+        self._flush(journal, lines)
+        return journal
+
+    @staticmethod
+    def _flush(journal, lines):
+        if lines:
+            journal.write("\n".join(lines) + "\n")
+        journal.flush()
+        os.fsync(journal.fileno())
+
+    # === Replay ===
+
+    @staticmethod
+    def exists(directory):
+        return any(os.path.exists(os.path.join(directory, name)) and os.path.getsize(os.path.join(directory, name))
+                   for name in (SNAPSHOT, JOURNAL))
+
+    @staticmethod
+    def read(directory):
+        """
+        Returns:
+            snapshot(dict): last snapshot ({} if none)
+            ops([dict]): journaled operations newer than the snapshot, in order
+        """
+        snapshot = {}
+        try:
+            with open(os.path.join(directory, SNAPSHOT), "r") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        ops = []
+        try:
+            with open(os.path.join(directory, JOURNAL), "r") as f:
+                for line in f:
+                    try:
+                        op = json.loads(line)
+                    except ValueError:
+                        break  # torn last write
+                    if op["seq"] > snapshot.get("seq", 0):
+                        ops.append(op)
+        except OSError:
+            pass
+        return snapshot, ops
+
+    @classmethod
+    def replay(cls, directory):
+        """
+        Session state after the snapshot and every journaled operation
+
+        Returns:
+            project(dict): {"scale", "symbols", "rooms"} in the annotation JSON layout (see project_from_dict)
+        """
+        snapshot, ops = cls.read(directory)
+        scale = snapshot.get("scale")
+        symbols = {s["id"]: dict(s) for s in snapshot.get("symbols", [])}
+        rooms = list(snapshot.get("rooms", []))
+
+        for op in ops:
+            kind = op["op"]
+            if kind in ("move", "edit") and op["id"] not in symbols or kind == "link" and op["switch"] not in symbols:
+                continue
+            if kind == "add":
+                symbols[op["symbol"]["id"]] = dict(op["symbol"])
+            elif kind == "move":
+                symbols[op["id"]]["coords"] = op["coords"]
+            elif kind == "edit":
+                symbols[op["id"]].update(op["fields"])
+            elif kind == "delete":
+                symbols.pop(op["id"], None)
+            elif kind == "link":
+                symbols[op["switch"]].setdefault("controls", []).append(op["light"])
+            elif kind == "scale":
+                scale = op["scale"]
+            elif kind == "room":
+                rooms.append({"name": op["name"], "polygon": op["polygon"]})
+        return {"scale": scale, "symbols": list(symbols.values()), "rooms": rooms}
+
+    @staticmethod
+    def discard(directory):
+        for name in (SNAPSHOT, JOURNAL):
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,86 @@
+import math
+
+
+class SpatialIndex:
+    def __init__(self, cell_size=32):
+        """
+        Uniform grid hash over 2D points for nearest-item queries (click hit-testing).
+        Items are bucketed by the cell their coordinates fall in, so a query only
+        looks at the few cells around the query point.
+
+        Class parameters:
+        cell_size
+        """
+        self.cell_size = cell_size
+        self._cells = {}
+        self._coords = {}
+
+    def __len__(self):
+        return len(self._coords)
+
+    def __contains__(self, item):
+        return item in self._coords
+
+    def _cell(self, coords):
+        return (math.floor(coords[0] / self.cell_size), math.floor(coords[1] / self.cell_size))
+
+    def insert(self, item, coords):
+        if item in self._coords:
+            self.remove(item)
+        self._coords[item] = coords
+        # dicts as ordered sets keep ties deterministic (first inserted wins)
+        self._cells.setdefault(self._cell(coords), {})[item] = None
+
+    def remove(self, item):
+        coords = self._coords.pop(item, None)
+        if coords is None:
+            return
+        cell = self._cell(coords)
+        bucket = self._cells[cell]
+        del bucket[item]
+        if not bucket:
+            del self._cells[cell]
+
+    def move(self, item, coords):
+        self.insert(item, coords)
+
+    def clear(self):
+        self._cells.clear()
+        self._coords.clear()
+
+    def nearest(self, x, y, radius):
+        """
+        Closest item to (x, y) within radius
+
+        Args:
+            x, y(float): query point
+            radius(float): only consider items within this distance
+        Returns:
+            item: the closest item, or None if there is none within radius
+        """
+        cx, cy = self._cell((x, y))
+        # An item in ring k is at least (k - 1) * cell_size away from the query point
+        max_ring = math.floor(radius / self.cell_size) + 1
+        best, best_d2 = None, radius * radius
+        for ring in range(max_ring + 1):
+            for cell in self._ring(cx, cy, ring):
+                for item in self._cells.get(cell, ()):
+                    ix, iy = self._coords[item]
+                    d2 = (ix - x)**2 + (iy - y)**2
+                    if d2 <= best_d2 and (best is None or d2 < best_d2):
+                        best, best_d2 = item, d2
+            if best is not None and best_d2 <= (ring * self.cell_size)**2:
+                break
+        return best
+
+    @staticmethod
+    def _ring(cx, cy, ring):
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for dx in range(-ring, ring + 1):
+            yield (cx + dx, cy - ring)
+            yield (cx + dx, cy + ring)
+        for dy in range(-ring + 1, ring):
+            yield (cx - ring, cy + dy)
+            yield (cx + ring, cy + dy)
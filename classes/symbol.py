@@ -1,17 +1,40 @@
 import uuid
 class Symbol:
     def __init__(self,type,coords,room,amperage,height,id=None):
+        self._registry = None  # SymbolRegistry holding this symbol, kept informed of moves
         self.id = id or uuid.uuid4().hex[:6]
         self.type = type
-        self.coords = coords
-        self.room = room
+        self._coords = coords
+        self._room = room
         self.amperage = amperage
         self.height = height
         self.controls = []
 
+    @property
+    def coords(self):
+        return self._coords
+
+    @coords.setter
+    def coords(self, value):
+        old = self._coords
+        self._coords = value
+        if self._registry is not None:
+            self._registry._moved(self, old)
+
+    @property
+    def room(self):
+        return self._room
+
+    @room.setter
+    def room(self, value):
+        old = self._room
+        self._room = value
+        if self._registry is not None:
+            self._registry._room_changed(self, old)
+
     def __str__(self):
         print(f"{self.id},{self.type},{self.coords},{self.room},{self.amperage},{self.height}")
-    
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -22,7 +45,7 @@ class Symbol:
             "height": self.height,
             "controls": [l.id for l in self.controls] if self.type == "switch" else []
         }
-    
+
     @staticmethod
     def from_dict(data, all_symbols=None):
         s = Symbol(
@@ -34,6 +57,18 @@ class Symbol:
             id=data["id"]
         )
         if s.type == "switch" and all_symbols:
-            # Post-link controlled lights after all symbols loaded
-            s.controls = [sym for sym in all_symbols if sym.id in data.get("controls", [])]
-        return s
\ No newline at end of file
+            # Post-link controlled lights after all symbols loaded; all_symbols may be
+            # anything with .get(id) (a dict or SymbolRegistry) or a plain list
+            by_id = all_symbols if hasattr(all_symbols, "get") else {sym.id: sym for sym in all_symbols}
+            s.controls = s.resolve_controls(data.get("controls", []), by_id)
+        return s
+
+    @staticmethod
+    def resolve_controls(control_ids, by_id):
+        """Symbols for control_ids, skipping ids that are not in by_id"""
+        controls = []
+        for cid in control_ids:
+            light = by_id.get(cid)
+            if light is not None:
+                controls.append(light)
+        return controls
\ No newline at end of file
@@ -0,0 +1,137 @@
+from classes.spatial_index import SpatialIndex
+
+
+def _node(coords):
+    return (int(coords[0]), int(coords[1]))
+
+
+class SymbolRegistry:
+    def __init__(self, symbols=()):
+        """
+        Ordered collection of the project's symbols, indexed by id, type, room,
+        snapped coordinate, each room's junction box and position (spatial).
+        Symbols notify their registry when their coords or room change.
+
+        Class parameters:
+        spatial
+        """
+        self._symbols = {}  # dict as an ordered set
+        self._by_id = {}
+        self._by_type = {}
+        self._by_room = {}
+        self._by_node = {}
+        self._junction_boxes = {}  # room -> its first junction box
+        self.spatial = SpatialIndex()
+        self.extend(symbols)
+
+    # === List interface ===
+
+    def __iter__(self):
+        return iter(self._symbols)
+
+    def __len__(self):
+        return len(self._symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self._symbols
+
+    def append(self, symbol):
+        if symbol in self._symbols:
+            return
+        self._symbols[symbol] = None
+        self._by_id[symbol.id] = symbol
+        self._by_type.setdefault(symbol.type, {})[symbol] = None
+        self._by_room.setdefault(symbol.room, {})[symbol] = None
+        self._by_node.setdefault(_node(symbol.coords), {})[symbol] = None
+        if symbol.type == "junction box":
+            self._junction_boxes.setdefault(symbol.room, symbol)
+        self.spatial.insert(symbol, symbol.coords)
+        symbol._registry = self
+
+    def extend(self, symbols):
+        for symbol in symbols:
+            self.append(symbol)
+
+    def remove(self, symbol):
+        if symbol not in self._symbols:
+            raise ValueError(f"{symbol} is not in the registry")
+        del self._symbols[symbol]
+        del self._by_id[symbol.id]
+        self._discard(self._by_type, symbol.type, symbol)
+        self._discard(self._by_room, symbol.room, symbol)
+        self._discard(self._by_node, _node(symbol.coords), symbol)
+        self._junction_box_left(symbol, symbol.room)
+        self.spatial.remove(symbol)
+        symbol._registry = None
+
+    def clear(self):
+        for symbol in self._symbols:
+            symbol._registry = None
+        self._symbols.clear()
+        self._by_id.clear()
+        self._by_type.clear()
+        self._by_room.clear()
+        self._by_node.clear()
+        self._junction_boxes.clear()
+        self.spatial.clear()
+
+    # === Index maintenance (called by Symbol setters) ===
+
+    @staticmethod
+    def _discard(index, key, symbol):
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(symbol, None)
+            if not bucket:
+                del index[key]
+
+    def _moved(self, symbol, old_coords):
+        self._discard(self._by_node, _node(old_coords), symbol)
+        self._by_node.setdefault(_node(symbol.coords), {})[symbol] = None
+        self.spatial.move(symbol, symbol.coords)
+
+    def _room_changed(self, symbol, old_room):
+        self._discard(self._by_room, old_room, symbol)
+        self._by_room.setdefault(symbol.room, {})[symbol] = None
+        if symbol.type == "junction box":
+            self._junction_box_left(symbol, old_room)
+            self._junction_boxes.setdefault(symbol.room, symbol)
+
+    def _junction_box_left(self, symbol, room):
+        """Hands room's junction box slot to the next one in the room when symbol held it"""
+        if self._junction_boxes.get(room) is symbol:
+            del self._junction_boxes[room]
+            successor = next((s for s in self._by_room.get(room, ()) if s.type == "junction box"), None)
+            if successor is not None:
+                self._junction_boxes[room] = successor
+
+    # === Lookups ===
+
+    def get(self, symbol_id):
+        return self._by_id.get(symbol_id)
+
+    def of_type(self, symbol_type):
+        return list(self._by_type.get(symbol_type, ()))
+
+    def first(self, symbol_type):
+        return next(iter(self._by_type.get(symbol_type, ())), None)
+
+    def in_room(self, room):
+        return list(self._by_room.get(room, ()))
+
+    def count_in_room(self, room):
+        return len(self._by_room.get(room, ()))
+
+    def rooms(self):
+        """Names of every assigned room, in the order they were first assigned"""
+        return [room for room in self._by_room if room is not None]
+
+    def junction_box(self, room):
+        return self._junction_boxes.get(room)
+
+    def at(self, node):
+        """Symbols whose (snapped) coordinates fall on node"""
+        return list(self._by_node.get(_node(node), ()))
+
+    def nearest(self, x, y, radius):
+        return self.spatial.nearest(x, y, radius)
@@ -1,46 +1,80 @@
-import uuid
+from classes.wire_table import GAUGES, WireTable
 
 class Wire:
-    def __init__(self,path,start_symbol,end_symbol,scale):
+    def __init__(self,path,start_symbol,end_symbol,scale,amperage=None):
         """
         Class parameters:
-        id, path, start_symbol, end_symbol, scale, type, length, gauge
+        id, path, start_symbol, end_symbol, scale, amperage, type, length, gauge
+
+        amperage defaults to the start symbol's amperage; daisy-chained wires pass
+        the load of every device downstream of them instead.
+
+        A Wire is a view on one row of a WireTable; building many wires at once
+        through WireTable.from_routes computes their lengths and gauges together.
         """
-        self.id = uuid.uuid4().hex[:6]
-        self.path = path
-        self.start_symbol = start_symbol
-        self.end_symbol =  end_symbol
-        self.scale = scale
-
-        #Internal Logic to Categorize Wire and Extract Information
-        if start_symbol.type != 'Junction Box':
-            self.type = 'Room Wire'
-        else:
-            self.type = 'Home Run Wire'
-        self.get_length_ft()
-        self.gauge = self.get_gauge()
-        
-    
+        self._bind(WireTable.from_routes([(path, start_symbol, end_symbol, amperage)], scale), 0)
+
+    @classmethod
+    def view(cls, table, row):
+        wire = cls.__new__(cls)
+        wire._bind(table, row)
+        return wire
+
+    def _bind(self, table, row):
+        self.table = table
+        self.row = row
+
+    @property
+    def id(self):
+        return str(self.table.ids[self.row])
+
+    @property
+    def path(self):
+        return self.table.path(self.row)
+
+    @property
+    def start_symbol(self):
+        return self.table.start_symbols[self.row]
+
+    @property
+    def end_symbol(self):
+        return self.table.end_symbols[self.row]
+
+    @property
+    def scale(self):
+        return self.table.scale
+
+    @property
+    def type(self):
+        #Internal Logic to Categorize Wire
+        return 'Home Run Wire' if self.table.is_home_run[self.row] else 'Room Wire'
+
+    @property
+    def length(self):
+        return float(self.table.length[self.row])
+
+    @property
+    def amperage(self):
+        return float(self.table.amperage[self.row])
+
+    @amperage.setter
+    def amperage(self, value):
+        self.table.amperage[self.row] = value
+
+    @property
+    def gauge(self):
+        return self.table.gauge(self.row)
+
+    @gauge.setter
+    def gauge(self, value):
+        self.table.gauge_code[self.row] = GAUGES.index(value)
+
     def get_length_ft(self):
-        total_length = sum(
-                    ((self.path[i+1][0]-self.path[i][0])**2 + (self.path[i+1][1]-self.path[i][1])**2)**0.5
-                    for i in range(len(self.path)-1)
-                )*self.scale
-        if self.type == 'Room Wire':
-            total_length += self.start_symbol.height
-        else:
-            total_length += self.end_symbol.height
-        self.length = total_length
+        return self.length
 
     def get_gauge(self):
-        if self.start_symbol.amperage <= 15:
-            return "14 AWG" if self.length <= 50 else "12 AWG"
-        elif self.start_symbol.amperage <= 20:
-            return "12 AWG" if self.length <= 50 else "10 AWG"
-        elif self.start_symbol.amperage <= 30:
-            return "10 AWG" if self.length <= 50 else "8 AWG"
-        else:
-            return "Consult engineer"
+        self.table.compute_gauges(slice(self.row, self.row + 1))
+        return self.gauge
 
     def __str__(self):
-        print(f"path")
\ No newline at end of file
+        print(f"path")
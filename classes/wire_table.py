@@ -0,0 +1,88 @@
+import uuid
+
+import numpy as np
+
+GAUGES = ["14 AWG", "12 AWG", "10 AWG", "8 AWG", "Consult engineer"]
+# Upper amperage bound of each class; a class picks GAUGES[class] for short runs and the next
+# heavier gauge for runs over LONG_RUN_FT. Loads above the last bound need an engineer.
+AMPERAGE_LIMITS = np.array([15, 20, 30], dtype=np.float64)
+LONG_RUN_FT = 50
+
+
+class WireTable:
+    def __init__(self, start_symbols, end_symbols, coords, offsets, amperage, scale):
+        """
+        Columnar storage for many wires: every path lives in one shared coordinate
+        buffer and lengths/gauges are computed for all wires at once.
+
+        Class parameters:
+        ids, start_symbols, end_symbols, start_ids, end_ids, coords, offsets,
+        amperage, scale, is_home_run, length, gauge_code
+        """
+        n = len(start_symbols)
+        self.ids = np.array([uuid.uuid4().hex[:6] for _ in range(n)], dtype="<U6")
+        self.start_symbols = list(start_symbols)
+        self.end_symbols = list(end_symbols)
+        self.start_ids = np.array([s.id for s in self.start_symbols], dtype=str)
+        self.end_ids = np.array([s.id for s in self.end_symbols], dtype=str)
+        self.coords = np.asarray(coords, dtype=np.int64).reshape(-1, 2)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.amperage = np.asarray(amperage, dtype=np.float64)
+        self.scale = scale
+        # Matches the historical Wire.type rule, which compares against 'Junction Box'
+        self.is_home_run = np.array([s.type == 'Junction Box' for s in self.start_symbols], dtype=bool)
+        self.gauge_code = np.zeros(n, dtype=np.int8)
+        self.compute_lengths()
+        self.compute_gauges()
+
+    @classmethod
+    def from_routes(cls, routes, scale):
+        """
+        Args:
+            routes([([(int,int)], Symbol, Symbol, float | None)]): path, start symbol,
+                end symbol and amperage (None for the start symbol's) of every wire
+            scale(float): ft/pixel scale of the plan
+        """
+        starts, ends, amperage, offsets, coords = [], [], [], [0], []
+        for path, start, end, amps in routes:
+            starts.append(start)
+            ends.append(end)
+            amps = start.amperage if amps is None else amps
+            amperage.append(np.nan if amps is None else amps)
+            coords.extend(path)
+            offsets.append(len(coords))
+        return cls(starts, ends, coords, offsets, amperage, scale)
+
+    def __len__(self):
+        return len(self.start_symbols)
+
+    def compute_lengths(self):
+        """Path length of every wire (vectorized segment sums) plus the drop to its device"""
+        segments = np.hypot(*np.diff(self.coords, axis=0).T) if len(self.coords) > 1 else np.zeros(0)
+        cumulative = np.concatenate(([0.0], np.cumsum(segments)))
+        first, last = self.offsets[:-1], np.maximum(self.offsets[1:] - 1, self.offsets[:-1])
+        path_px = cumulative[last] - cumulative[first] if len(self) else np.zeros(0)
+
+        heights = np.array([float(e.height if home else s.height)
+                            for s, e, home in zip(self.start_symbols, self.end_symbols, self.is_home_run)],
+                           dtype=np.float64)
+        self.length = path_px * self.scale + heights
+
+    def compute_gauges(self, rows=slice(None)):
+        """Gauge of every wire (or of rows) from its amperage class and run length"""
+        amp_class = np.searchsorted(AMPERAGE_LIMITS, self.amperage[rows], side="left")
+        code = amp_class + (self.length[rows] > LONG_RUN_FT)
+        self.gauge_code[rows] = np.where(amp_class >= len(AMPERAGE_LIMITS), len(GAUGES) - 1, code)
+
+    def path(self, row):
+        return [(int(x), int(y)) for x, y in self.coords[self.offsets[row]:self.offsets[row + 1]]]
+
+    def gauge(self, row):
+        return GAUGES[self.gauge_code[row]]
+
+    def wire(self, row):
+        from classes.wire import Wire
+        return Wire.view(self, row)
+
+    def wires(self):
+        return [self.wire(row) for row in range(len(self))]
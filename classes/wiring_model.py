@@ -0,0 +1,287 @@
+from classes.wire import Wire
+from classes.wire_table import WireTable
+from utils.cache_utils import decode_routes, encode_routes, route_cache_key
+from utils.hanan_utils import snap_to_grid
+from utils.routing_utils import daisy_chain, downstream_loads, route_rooms, route_to_targets, symbol_node
+
+PANEL_CONNECTIONS = "panel_connections"
+
+
+class WiringModel:
+    def __init__(self, grid, symbols, scale, routing, threshold=1000):
+        """
+        Routed wiring of a project that keeps track of which wires depend on
+        which symbols, so editing one symbol only recomputes what it affects:
+        the symbol's own wires, its room's junction box amperage and that
+        room's home run.
+
+        Class parameters:
+        grid, symbols, scale, routing, threshold, requests_by_room,
+        paths_by_room, total_amp_by_room, electrical_panel
+        """
+        self.grid = grid
+        self.symbols = symbols
+        self.scale = scale
+        self.routing = routing
+        self.threshold = threshold
+        self.requests_by_room = {}
+        self.paths_by_room = {}
+        self.total_amp_by_room = {}
+        self.electrical_panel = None
+
+    @property
+    def panel_max_amp(self):
+        return sum(self.total_amp_by_room.values())
+
+    def wires(self, room=None):
+        rooms = self.paths_by_room if room is None else [room]
+        return [wire for r in rooms for device_path in self.paths_by_room.get(r, []) for wire in device_path.values()]
+
+    # === Full build ===
+
+    def room_devices(self, room):
+        return [s for s in self.symbols.in_room(room) if s.type != "electrical panel"]
+
+    def room_requests(self, room):
+        """(start symbol, end symbol) of every wire in a room"""
+        devices = self.room_devices(room)
+        junction = self.symbols.junction_box(room)
+
+        if self.routing['topology'] == "steiner":
+            return daisy_chain(junction, devices)
+
+        requests = []
+        for device in devices:
+            if device is junction:
+                continue
+
+            # --- Switch Case: Add wires from light → switch, then switch → junction ---
+            if device.type == "switch":
+                for light in device.controls:
+                    requests.append((light, device))
+                requests.append((device, junction))
+
+            # --- Other Devices (e.g. outlets) ---
+            elif device.type != "light":  # lights are only added via their switch
+                requests.append((device, junction))
+        return requests
+
+    def tree_roots(self):
+        """Nodes of the junction boxes and the panel, the targets routed with a shared shortest path tree"""
+        return {symbol_node(s) for symbol_type in ("junction box", "electrical panel")
+                for s in self.symbols.of_type(symbol_type)}
+
+    def build(self, cache=None):
+        """
+        Routes every wire of the project
+
+        Args:
+            cache(RouteCache): optional on-disk cache of routed paths
+        Returns:
+            paths_by_room({str: [{Symbol: Wire}]}): wires per room plus the home runs
+        """
+        #Step 1: Collect every wire as a (start symbol, end symbol) request
+        rooms = [room for room in self.symbols.rooms() if self.room_devices(room)]
+        self.requests_by_room = {room: self.room_requests(room) for room in rooms}
+
+        self.electrical_panel = self.symbols.first("electrical panel")
+        if self.electrical_panel:
+            self.requests_by_room[PANEL_CONNECTIONS] = [
+                (s, self.electrical_panel) for s in self.symbols.of_type("junction box")
+            ]
+        else:
+            print(" No electrical panel found. Skipping panel connections.")
+
+        #Step 2: Route all requests by wire length, one shortest path tree per junction box / panel
+        pairs_by_room = {room: [(symbol_node(start), symbol_node(end)) for start, end in requests]
+                         for room, requests in self.requests_by_room.items()}
+        cached = None
+        if cache:
+            cache_key = route_cache_key(self.grid, pairs_by_room, self.scale, self.routing)
+            cached = cache.get(cache_key)
+        if cached:
+            room_routes = decode_routes(cached)
+            print("✅ Reusing cached routes")
+        else:
+            room_routes = route_rooms(self.grid, pairs_by_room, self.scale,
+                                      mode=self.routing['mode'], workers=self.routing['workers'], roots=self.tree_roots())
+            if cache:
+                cache.put(cache_key, encode_routes(room_routes))
+
+        #Step 3: Room by Room Wiring, with every room wire measured and gauged in one table
+        self.paths_by_room.clear()
+        self.total_amp_by_room.clear()
+        rows = []
+        for room in rooms:
+            loads = self.room_loads(self.requests_by_room[room])
+            rows += [(req, path, loads.get(req[0])) for req, path in zip(self.requests_by_room[room], room_routes[room])]
+        wires = self._make_wires(rows)
+        for room in rooms:
+            self.paths_by_room[room] = []
+            self._update_room(room, wires={req: wires[req] for req in self.requests_by_room[room]})
+
+        #Step 4: Home Run Wiring (after junction box amperages are known)
+        if self.electrical_panel:
+            self.paths_by_room[PANEL_CONNECTIONS] = []
+            requests = self.requests_by_room[PANEL_CONNECTIONS]
+            wires = self._make_wires([(req, path, None) for req, path in zip(requests, room_routes[PANEL_CONNECTIONS])])
+            for junction, panel in requests:
+                self._set_home_run(junction, wires[(junction, panel)])
+
+        return self.paths_by_room
+
+    # === Incremental updates ===
+
+    def move_symbol(self, symbol, coords):
+        """
+        Moves a symbol (snapped onto the grid, extending its axes if needed) and
+        re-routes only the wires that start or end at it
+
+        Returns:
+            removed([Wire]), updated([Wire]): wires to erase and to (re)draw
+        """
+        old_node = symbol_node(symbol)
+        node = snap_to_grid(self.grid, coords, self.scale, self.threshold)
+        self.grid.add_node(node)
+        symbol.coords = node
+        if not self.symbols.at(old_node):
+            self.grid.set_dot(old_node, False)
+        return self._refresh(symbol, moved=True)
+
+    def set_amperage(self, symbol, amperage):
+        """
+        Changes a device's load: re-gauges its room's wires and home run without re-routing
+
+        Returns:
+            removed([Wire]), updated([Wire]): wires to erase and to (re)draw
+        """
+        symbol.amperage = amperage
+        return self._refresh(symbol, moved=False)
+
+    def add_symbol(self, symbol):
+        """
+        Adds a symbol, extending the grid axes incrementally, and wires it into its room
+
+        Returns:
+            removed([Wire]), updated([Wire]): wires to erase and to (re)draw
+        """
+        node = snap_to_grid(self.grid, symbol.coords, self.scale, self.threshold)
+        self.grid.add_node(node)
+        symbol.coords = node
+        self.symbols.append(symbol)
+        return self._refresh(symbol, moved=True)
+
+    def _refresh(self, symbol, moved):
+        removed, updated = [], []
+        if symbol.type == "electrical panel":
+            if moved:
+                for junction, _ in self.requests_by_room.get(PANEL_CONNECTIONS, []):
+                    r, u = self._update_home_run(junction, reroute=True)
+                    removed += r
+                    updated += u
+            return removed, updated
+
+        room = symbol.room
+        if room is None:
+            return removed, updated
+        self.paths_by_room.setdefault(room, [])
+        r, u = self._update_room(room, moved={symbol} if moved else set())
+        removed += r
+        updated += u
+        junction = self.symbols.junction_box(room)
+        r, u = self._update_home_run(junction, reroute=moved and symbol is junction)
+        removed += r
+        updated += u
+        return removed, updated
+
+    def room_loads(self, requests):
+        # Daisy-chained wires carry every device downstream of them
+        return downstream_loads(requests) if self.routing['topology'] == "steiner" else {}
+
+    def _make_wires(self, rows):
+        """
+        Builds the wires of many routed requests in one WireTable
+
+        Args:
+            rows([((Symbol, Symbol), [(int,int)] | None, float | None)]): request, path and amperage
+        Returns:
+            wires({(Symbol, Symbol): Wire | None}): None where no path was found
+        """
+        found = [(path, start, end, amps) for (start, end), path, amps in rows if path is not None]
+        table = WireTable.from_routes(found, self.scale)
+        views = iter(table.wires())
+        return {req: None if path is None else next(views) for req, path, _ in rows}
+
+    def _update_room(self, room, moved=(), wires=None):
+        """
+        Brings a room's wires up to date. Wires whose endpoints are unchanged keep
+        their path and are only re-gauged; new ones and those touching a moved
+        symbol are routed (or taken from wires when given).
+        """
+        old_wires = {(w.start_symbol, w.end_symbol): w for w in self.wires(room)}
+        requests = list(wires) if wires is not None else self.room_requests(room)
+        self.requests_by_room[room] = requests
+        loads = self.room_loads(requests)
+
+        if wires is None:
+            stale = [req for req in requests
+                     if req not in old_wires or req[0] in moved or req[1] in moved]
+            paths = route_to_targets(self.grid, [(symbol_node(s), symbol_node(e)) for s, e in stale],
+                                     self.scale, mode=self.routing['mode'], roots=self.tree_roots())
+            wires = self._make_wires([(req, path, loads.get(req[0])) for req, path in zip(stale, paths)])
+
+        room_paths, updated, total_amp = [], [], 0
+        for start, end in requests:
+            amperage = start.amperage if loads.get(start) is None else loads[start]
+            if (start, end) in wires:
+                wire = wires[(start, end)]
+                if wire is None:
+                    print(f"❌ No path from {start.type} {start.id} to {end.type} {end.id} in room '{room}'")
+                    continue
+                updated.append(wire)
+            else:
+                wire = old_wires[(start, end)]
+                if wire.amperage != amperage:
+                    wire.amperage = amperage
+                    wire.gauge = wire.get_gauge()
+                    updated.append(wire)
+            room_paths.append({start: wire})
+            total_amp += start.amperage
+
+        kept = set(id(w) for d in room_paths for w in d.values())
+        removed = [w for w in old_wires.values() if id(w) not in kept]
+        self.paths_by_room[room] = room_paths
+        self.total_amp_by_room[room] = min(total_amp * 0.3, 20)
+        self.symbols.junction_box(room).amperage = self.total_amp_by_room[room]
+        return removed, updated
+
+    def _update_home_run(self, junction, reroute):
+        if not self.electrical_panel or PANEL_CONNECTIONS not in self.paths_by_room:
+            return [], []
+        old = next((w for w in self.wires(PANEL_CONNECTIONS) if w.start_symbol is junction), None)
+        if old and not reroute:
+            if old.amperage == junction.amperage:
+                return [], []
+            old.amperage = junction.amperage
+            old.gauge = old.get_gauge()
+            return [], [old]
+        path = route_to_targets(self.grid, [(symbol_node(junction), symbol_node(self.electrical_panel))],
+                                self.scale, mode=self.routing['mode'])[0]
+        new = self._set_home_run(junction, None if path is None else Wire(path, junction, self.electrical_panel, self.scale))
+        return [old] if old else [], [new] if new else []
+
+    def _set_home_run(self, junction, wire):
+        panel_paths = self.paths_by_room[PANEL_CONNECTIONS]
+        index = next((k for k, d in enumerate(panel_paths) if junction in d), None)
+        if (junction, self.electrical_panel) not in self.requests_by_room[PANEL_CONNECTIONS]:
+            self.requests_by_room[PANEL_CONNECTIONS].append((junction, self.electrical_panel))
+        if wire is None:
+            print(f"No path from {junction} to {self.electrical_panel}")
+            if index is not None:
+                del panel_paths[index]
+            return None
+        if index is None:
+            panel_paths.append({junction: wire})
+        else:
+            panel_paths[index] = {junction: wire}
+        return wire
@@ -16,4 +16,57 @@ UNIT_PRICES = {
     "10 AWG": 0.8,
     "8 AWG": 1,
     "Consult engineer": 0.00  # default fallback
-}
\ No newline at end of file
+}
+
+#Clustering threshold used to snap symbols onto shared Hanan grid axes
+SNAP_THRESHOLD = 1000
+
+#How RoomAnnotator draws the Hanan grid: 'raster' draws the symbol nodes as canvas items and the
+#rest of the lattice as one image of the visible area, 'items' draws a canvas item per axis and node
+GRID_RENDER = 'raster'
+
+#Resolution of the exported wiring layout image; 96 keeps one plan pixel per image pixel
+EXPORT_DPI = 96
+
+#Tiled multi-resolution copy of the floor plan (output/tile_cache) the canvases load tiles from;
+#built once per image and reused while the image file is unchanged
+IMAGE_TILES = {
+    'directory': 'output/tile_cache',
+    'tile_size': 512,
+}
+
+#Autosave journal of annotation sessions (output/journal/<image>/): edits are appended in batches
+#every flush_interval seconds and compacted into a snapshot every compact_every edits
+AUTOSAVE = {
+    'directory': 'output/journal',
+    'flush_interval': 0.5,
+    'compact_every': 500,
+}
+
+#Routing options
+#mode: 'graph' searches the Hanan grid, 'direct' builds L-shaped paths straight from the grid axes
+#      (falls back to the graph search when the grid has blocked edges)
+#topology: 'star' runs a wire from every device to its junction box, 'steiner' daisy-chains
+#          the devices of a room along a rectilinear spanning tree rooted at the junction box
+#workers: number of processes rooms are routed on in parallel, 0 routes them in the GUI process
+ROUTING = {
+    'mode': 'graph',
+    'topology': 'star',
+    'workers': 0,
+}
+
+#On-disk cache of routed paths (output/route_cache), keyed by the grid, wire endpoints,
+#scale and routing options; least recently used entries are evicted past max_bytes
+ROUTE_CACHE = {
+    'enabled': True,
+    'max_bytes': 256 * 1024 * 1024,
+}
+
+#Local routing/costing HTTP service (server.py); it only listens on loopback addresses.
+#cache_entries is how many recent results are kept in memory to answer repeated requests
+SERVICE = {
+    'host': '127.0.0.1',
+    'port': 8765,
+    'workers': 2,
+    'cache_entries': 64,
+}
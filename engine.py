@@ -0,0 +1,305 @@
+# engine.py
+# GUI-free wiring pipeline: annotation JSON -> Hanan grid -> rooms -> routed wires -> BOM and instructions.
+# Run as a CLI to re-cost a directory of saved projects:  python engine.py output/ -o output/batch -j 4
+
+import argparse
+import glob
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from classes.project_archive import ProjectArchive
+from classes.wiring_model import PANEL_CONNECTIONS, WiringModel
+from config import ROUTE_CACHE, ROUTING, SNAP_THRESHOLD, UNIT_PRICES
+from utils.cache_utils import RouteCache
+from utils.export_utils import (bill_of_materials, bom_csv_rows, bom_latex_lines, export_rows,
+                                instructions_csv_rows, instructions_latex_lines, json_chunks,
+                                write_chunks, write_csv, write_lines)
+from utils.hanan_utils import annotations_to_hanan_grid
+from utils.project_utils import load_project, save_project_archive
+from utils.room_utils import assign_room
+
+
+def make_container(symbols, scale, rooms=(), routing=None):
+    """
+    Container holding what the headless stages need, with config defaults
+
+    Args:
+        symbols(SymbolRegistry): annotated symbols
+        scale(float): ft/pixel scale of the plan
+        rooms([([(int,int)], str)]): room outlines and names
+        routing(dict): routing options, config ROUTING if None
+    Returns:
+        container(dict): same keys the GUI stages use
+    """
+    return {
+        'symbols': symbols,
+        'scale': scale,
+        'rooms': list(rooms),
+        'unit_prices': UNIT_PRICES,
+        'snap_threshold': SNAP_THRESHOLD,
+        'routing': dict(routing or ROUTING),
+        'route_cache': ROUTE_CACHE,
+    }
+
+
+def build_grid(container):
+    """Snaps the symbols and builds container['grid'], as RoomAnnotator does"""
+    container['grid'], _, _, container['symbols'] = annotations_to_hanan_grid(
+        container['symbols'], container['scale'], threshold=container['snap_threshold'])
+    return container['grid']
+
+
+def assign_rooms(container):
+    """Assigns every roomless symbol to the saved room outline it falls in"""
+    for polygon, room_name in container['rooms']:
+        assign_room(container['grid'], container['symbols'], polygon, room_name)
+
+
+def create_wiring(container, cache_dir=None):
+    """
+    Routes every wire of the project
+
+    Args:
+        container(dict): project with grid, symbols, scale and routing options
+        cache_dir(str): route cache directory, no cache if None or disabled
+    Returns:
+        wiring(WiringModel): built wiring; wiring.paths_by_room holds the wires
+    """
+    cache = None
+    if cache_dir and container['route_cache']['enabled']:
+        cache = RouteCache(cache_dir, container['route_cache']['max_bytes'])
+
+    wiring = WiringModel(container['grid'], container['symbols'], container['scale'],
+                         container['routing'], threshold=container['snap_threshold'])
+    wiring.build(cache)
+    return wiring
+
+
+def restore_wiring(container, routes):
+    """
+    WiringModel holding a project archive's saved wires, without routing
+
+    Args:
+        container(dict): project with grid, symbols, scale and routing options
+        routes(dict): ProjectArchive.routes's {"routing", "total_amp_by_room", "paths_by_room"}
+    """
+    wiring = WiringModel(container['grid'], container['symbols'], container['scale'],
+                         container['routing'], threshold=container['snap_threshold'])
+    wiring.paths_by_room = routes["paths_by_room"]
+    wiring.total_amp_by_room = dict(routes["total_amp_by_room"])
+    wiring.requests_by_room = {room: [(w.start_symbol, w.end_symbol) for d in device_paths for w in d.values()]
+                               for room, device_paths in wiring.paths_by_room.items()}
+    wiring.electrical_panel = container['symbols'].first("electrical panel")
+    return wiring
+
+
+def calculate_cost(paths_by_room, panel_max_amp, unit_prices):
+    """
+    Bill of materials of a routed project
+
+    Args:
+        paths_by_room({str: [{Symbol: Wire}]}): wires per room plus the home runs
+        panel_max_amp(float): total load on the panel
+        unit_prices({str: float}): price per ft of each wire gauge
+    Returns:
+        grand_total(float), table_rows([(int, str, float, float, float)]): level, material,
+            quantity, unit cost and total cost of every BOM line
+    """
+    return bill_of_materials(export_rows(paths_by_room), room_count(paths_by_room), panel_max_amp, unit_prices)
+
+
+def room_count(paths_by_room):
+    """Rooms on the panel, one breaker each"""
+    return sum(1 for room in paths_by_room if room != PANEL_CONNECTIONS)
+
+
+def write_bom_latex(output, grand_total, table_rows):
+    """Writes the LaTeX bill of materials for calculate_cost's result"""
+    write_lines(output, bom_latex_lines(grand_total, table_rows))
+
+
+def write_manufacturing_instructions_latex(output, paths_by_room, rows=None):
+    """Writes the LaTeX cutting, stripping and connection instructions of every wire"""
+    write_lines(output, instructions_latex_lines(rows if rows is not None else export_rows(paths_by_room)))
+
+
+def write_exports(directory, paths_by_room, panel_max_amp, unit_prices):
+    """
+    Writes every export of a routed project from one pass over its wires:
+    bill_of_materials.tex, manufacturing_instructions.tex, bill_of_materials.csv,
+    wiring_instructions.csv and wiring.json in directory
+
+    Returns:
+        grand_total(float), table_rows([(int, str, float, float, float)]): as calculate_cost
+    """
+    rows = export_rows(paths_by_room)
+    grand_total, table_rows = bill_of_materials(rows, room_count(paths_by_room), panel_max_amp, unit_prices)
+
+    os.makedirs(directory, exist_ok=True)
+    write_lines(os.path.join(directory, "bill_of_materials.tex"), bom_latex_lines(grand_total, table_rows))
+    write_lines(os.path.join(directory, "manufacturing_instructions.tex"), instructions_latex_lines(rows))
+    write_csv(os.path.join(directory, "bill_of_materials.csv"), bom_csv_rows(rows))
+    write_csv(os.path.join(directory, "wiring_instructions.csv"), instructions_csv_rows(rows))
+    write_chunks(os.path.join(directory, "wiring.json"), json_chunks(rows, grand_total, table_rows))
+    return grand_total, table_rows
+
+
+# === Batch pipeline ===
+
+def solve(project, routing=None, cache_dir=None):
+    """
+    Runs the whole pipeline on a loaded project
+
+    Args:
+        project(dict): {"symbols", "scale", "rooms"} from load_project / project_from_dict;
+            the routes of a project archive are reused when saved with the same routing options
+        routing(dict): routing options, config ROUTING if None
+        cache_dir(str): route cache directory, no cache if None
+    Returns:
+        result(dict): container, wiring, grand_total, table_rows and the
+            seconds spent per step in timings
+    """
+    if project["scale"] is None:
+        raise ValueError("annotation has no scale")
+    if not project["rooms"] and not project["symbols"].rooms():
+        raise ValueError("annotation has no rooms; save it from the Room Annotator")
+
+    timings = {}
+    start = time.perf_counter()
+    container = make_container(project["symbols"], project["scale"], project["rooms"], routing)
+    routes = project.get("routes")
+    saved = routes is not None and project["grid"] is not None and \
+        routes["routing"] == {key: container['routing'][key] for key in ("mode", "topology")}
+    if saved:
+        # Archived with routes for the same routing options: already snapped, assigned and routed
+        container['grid'] = project["grid"]
+    else:
+        build_grid(container)
+        assign_rooms(container)
+    timings["grid"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    wiring = restore_wiring(container, routes) if saved else create_wiring(container, cache_dir=cache_dir)
+    timings["route"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    grand_total, table_rows = calculate_cost(wiring.paths_by_room, wiring.panel_max_amp, container['unit_prices'])
+    timings["cost"] = time.perf_counter() - start
+    return {"container": container, "wiring": wiring, "grand_total": grand_total,
+            "table_rows": table_rows, "timings": timings}
+
+
+def summarize(result):
+    """
+    JSON-serializable view of solve's result: every wire with its room, endpoints,
+    path, length and gauge, plus the bill of materials
+    """
+    wiring = result["wiring"]
+    wires = []
+    for room, device_path_list in wiring.paths_by_room.items():
+        for device_path in device_path_list:
+            for wire in device_path.values():
+                wires.append({
+                    "id": wire.id,
+                    "room": room,
+                    "start": {"id": wire.start_symbol.id, "type": wire.start_symbol.type},
+                    "end": {"id": wire.end_symbol.id, "type": wire.end_symbol.type},
+                    "path": [list(node) for node in wire.path],
+                    "length": round(wire.length, 2),
+                    "gauge": wire.gauge,
+                    "amperage": None if math.isnan(wire.amperage) else wire.amperage,
+                })
+    return {
+        "total": round(result["grand_total"], 2),
+        "panel_max_amp": wiring.panel_max_amp,
+        "bom": [{"level": level, "material": name, "quantity": qty, "unit_cost": unit, "total_cost": total}
+                for level, name, qty, unit, total in result["table_rows"]],
+        "wires": wires,
+    }
+
+
+def run_project(path, output_dir, routing=None):
+    """
+    Routes and costs one saved project and writes its BOM, instructions and
+    wire tables to output_dir/<project name>/ (see write_exports), along with a
+    project archive that re-costs without routing
+
+    Args:
+        path(str): annotation JSON saved with its rooms (RoomAnnotator's Done), or a project archive
+        output_dir(str): batch output directory
+        routing(dict): routing options, config ROUTING if None
+    Returns:
+        summary(dict): project name, grand total and number of wires
+    """
+    result = solve(load_project(path), routing, cache_dir=os.path.join(output_dir, "route_cache"))
+    wiring = result["wiring"]
+
+    container = result["container"]
+    name = os.path.splitext(os.path.basename(path))[0]
+    project_dir = os.path.join(output_dir, name)
+    write_exports(project_dir, wiring.paths_by_room, wiring.panel_max_amp, container['unit_prices'])
+    save_project_archive(os.path.join(project_dir, name + ProjectArchive.EXTENSION), container['symbols'],
+                         container['scale'], container['rooms'], container['grid'], wiring)
+    return {"project": name, "total": round(result["grand_total"], 2), "wires": len(wiring.wires())}
+
+
+def run_batch(paths, output_dir, workers=0, routing=None):
+    """
+    Runs run_project over many projects, in a process pool when workers > 0
+
+    Returns:
+        results([dict]): one summary per project, or {"project", "error"} if it failed
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # Projects already run in parallel, so each one routes its rooms in-process
+    routing = dict(routing or ROUTING, workers=0)
+
+    results = []
+    if workers > 0:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [(path, pool.submit(run_project, path, output_dir, routing)) for path in paths]
+            for path, future in futures:
+                results.append(_collect(path, future.result))
+    else:
+        for path in paths:
+            results.append(_collect(path, lambda: run_project(path, output_dir, routing)))
+    return results
+
+
+def _collect(path, run):
+    try:
+        result = run()
+        print(f"✅ {result['project']}: {result['wires']} wires, total ${result['total']:.2f}")
+    except Exception as e:
+        result = {"project": os.path.splitext(os.path.basename(path))[0], "error": str(e)}
+        print(f"⚠️ {result['project']}: {e}")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Route and cost saved annotation projects without the GUI.")
+    parser.add_argument("input", help="directory of annotation JSON files / project archives (or a single file)")
+    parser.add_argument("-o", "--output", default=os.path.join("output", "batch"), help="output directory")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="projects processed in parallel (0 runs them in this process)")
+    parser.add_argument("--mode", choices=["graph", "direct"], default=ROUTING['mode'])
+    parser.add_argument("--topology", choices=["star", "steiner"], default=ROUTING['topology'])
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.input):
+        paths = sorted(glob.glob(os.path.join(args.input, "*.json")) +
+                       glob.glob(os.path.join(args.input, "*" + ProjectArchive.EXTENSION)))
+    else:
+        paths = [args.input]
+    routing = dict(ROUTING, mode=args.mode, topology=args.topology)
+    results = run_batch(paths, args.output, workers=args.workers, routing=routing)
+
+    failed = sum(1 for r in results if "error" in r)
+    print(f"Processed {len(results) - failed}/{len(results)} projects into {os.path.abspath(args.output)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
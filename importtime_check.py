@@ -0,0 +1,81 @@
+# importtime_check.py
+# Cold-start regression check: imports a module in a fresh interpreter under `python -X importtime`
+# and fails if it takes longer than the budget or pulls in a module that should load lazily.
+#   python importtime_check.py                     (checks main.py against the defaults below)
+#   python importtime_check.py --budget-ms 150 --runs 5 --top 15
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+# Modules the GUI must not import before its window is up; they load with their stage
+LAZY_MODULES = ("matplotlib", "networkx", "numpy", "PIL", "engine",
+                "symbol_annotator", "room_annotator", "wiring_visualizer")
+BUDGET_MS = 150
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(module, python=sys.executable):
+    """
+    Imports module in a fresh interpreter with -X importtime
+
+    Returns:
+        times({str: (int, int)}): self and cumulative microseconds of every imported module
+    """
+    proc = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=os.path.dirname(os.path.abspath(__file__)),
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr}")
+    times = {}
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            times[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return times
+
+
+def check(module="main", budget_ms=BUDGET_MS, runs=3, lazy=LAZY_MODULES, top=10):
+    """
+    Returns:
+        failures([str]): budget or lazy-import violations, empty when the check passes
+    """
+    # Best of several runs, so a busy machine does not fail the check
+    samples = [import_times(module) for _ in range(runs)]
+    best = min(samples, key=lambda times: times[module][1])
+    total_ms = best[module][1] / 1000
+
+    print(f"⏱️ import {module}: {total_ms:.1f} ms (best of {runs}, budget {budget_ms} ms)")
+    for name, (own, cumulative) in sorted(best.items(), key=lambda item: -item[1][0])[:top]:
+        print(f"   {own / 1000:8.1f} ms self {cumulative / 1000:8.1f} ms total  {name}")
+
+    failures = []
+    if total_ms > budget_ms:
+        failures.append(f"import {module} took {total_ms:.1f} ms, over the {budget_ms} ms budget")
+    eager = sorted(({name.split(".")[0] for name in best} & set(lazy)) - {module.split(".")[0]})
+    if eager:
+        failures.append(f"import {module} loads modules that should be lazy: {', '.join(eager)}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the GUI's cold-start import time.")
+    parser.add_argument("module", nargs="?", default="main")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list")
+    args = parser.parse_args(argv)
+
+    failures = check(args.module, args.budget_ms, args.runs, top=args.top)
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ Startup imports within budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
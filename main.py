@@ -1,12 +1,21 @@
 # main.py
 
+import importlib
+import threading
 import tkinter as tk
-from symbol_annotator import SymbolAnnotator
-from room_annotator import RoomAnnotator
-from wiring_visualizer import WiringVisualizer
-from utils.graph_utils import draw_paths_on_grid  # optional: for matplotlib plotting
+from classes.symbol_registry import SymbolRegistry
 from config import *
 
+# Stage modules (and numpy, PIL, matplotlib and the routing engine behind them) are imported
+# when their stage starts, so the window opens first. The later stages are preloaded in the
+# background while the user works on the first one. importtime_check.py guards this.
+LATER_STAGES = ("room_annotator", "wiring_visualizer")
+
+
+def preload_stages():
+    for name in LATER_STAGES:
+        importlib.import_module(name)
+
 def main():
     root = tk.Tk()
     root.title("Electrical Planner")
@@ -15,37 +24,51 @@ def main():
     container = {
         'ceiling_height': CEILING_HEIGHT,
         'default': DEFAULTS,
-        'symbols': [],
+        'symbols': SymbolRegistry(),
+        'rooms': [],
+        'image': None,
         'image_path': None,
         'image_name': None,
         'symbol_types' : SYMBOL_TYPES,
-        'unit_prices': UNIT_PRICES
+        'unit_prices': UNIT_PRICES,
+        'snap_threshold': SNAP_THRESHOLD,
+        'grid_render': GRID_RENDER,
+        'export_dpi': EXPORT_DPI,
+        'image_tiles': IMAGE_TILES,
+        'autosave': AUTOSAVE,
+        'journal': None,
+        'routing': dict(ROUTING),
+        'route_cache': ROUTE_CACHE
     }
 
     # === Step 3: WiringVisualizer ===
     def start_wiring_visualizer(container):
+        from wiring_visualizer import WiringVisualizer
         clear_window()
         wiring_frame = WiringVisualizer(root,container)
         wiring_frame.pack(fill="both", expand=True)
 
     # === Step 2: RoomAnnotator ===
     def start_room_annotator(container):
+        from room_annotator import RoomAnnotator
         clear_window()
         room_frame = RoomAnnotator(root, container, on_done=start_wiring_visualizer)
         room_frame.pack(fill="both", expand=True)
 
     # === Step 1: SymbolAnnotator ===
     def start_symbol_annotator():
+        from symbol_annotator import SymbolAnnotator
         symbol_frame = SymbolAnnotator(root,container,on_done=start_room_annotator)
         symbol_frame.pack(fill="both", expand=True)
+        threading.Thread(target=preload_stages, name="preload-stages", daemon=True).start()
 
     # Helper to remove previous frame widgets
     def clear_window():
         for widget in root.winfo_children():
             widget.pack_forget()
 
-    # Start the GUI app
-    start_symbol_annotator()
+    # Start the GUI app once the window is up
+    root.after(0, start_symbol_annotator)
     root.mainloop()
 
 if __name__ == "__main__":
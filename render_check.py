@@ -0,0 +1,80 @@
+# render_check.py
+# Headless rendering regression check: renders a synthetic wired project at several DPIs, each in a
+# fresh process with a time limit, and fails if a render errors or does not finish (dash patterns
+# scale by dpi / 96, so non-multiples of 96 give fractional dash lengths).
+#   python render_check.py                         (dpi 100 and 200)
+#   python render_check.py --dpi 96 150 300 --timeout 60
+
+import argparse
+import multiprocessing
+import time
+
+DPIS = [100, 200]
+TIMEOUT = 30  # seconds per render
+
+
+def render_once(dpi, symbols=200, seed=0, threshold=10):
+    """
+    Routes a seeded synthetic project (as benchmarks.pipeline does) and renders it at dpi with labels
+
+    Returns:
+        size((int, int)): pixel size of the rendering
+    """
+    from PIL import Image
+
+    from benchmarks.synthetic import project_of_size
+    from engine import assign_rooms, build_grid, create_wiring, make_container
+    from utils.render_utils import render_layout
+
+    project = project_of_size(symbols, seed=seed)
+    container = make_container(project["symbols"], project["scale"], project["rooms"])
+    container['snap_threshold'] = threshold
+    build_grid(container)
+    assign_rooms(container)
+    wiring = create_wiring(container)
+
+    symbols = container['symbols']
+    width = max(x for x, _ in (s.coords for s in symbols)) + 40
+    height = max(y for _, y in (s.coords for s in symbols)) + 40
+    plan = Image.new("RGB", (int(width), int(height)), "white")
+    return render_layout(plan, symbols, wiring.wires(), dpi=dpi).size
+
+
+def check(dpis=DPIS, timeout=TIMEOUT):
+    """
+    Returns:
+        failures([str]): renders that failed or timed out, empty when the check passes
+    """
+    failures = []
+    for dpi in dpis:
+        start = time.perf_counter()
+        process = multiprocessing.Process(target=render_once, args=(dpi,))
+        process.start()
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+            failures.append(f"render at dpi {dpi} did not finish within {timeout} s")
+        elif process.exitcode != 0:
+            failures.append(f"render at dpi {dpi} failed (exit code {process.exitcode})")
+        else:
+            print(f"⏱️ dpi {dpi}: {time.perf_counter() - start:.2f} s")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that the headless renderer finishes at several DPIs.")
+    parser.add_argument("--dpi", type=int, nargs="+", default=DPIS)
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="seconds allowed per render")
+    args = parser.parse_args(argv)
+
+    failures = check(args.dpi, args.timeout)
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ Layout renders at every DPI")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
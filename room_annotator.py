@@ -1,8 +1,15 @@
 import tkinter as tk
+import os
+from datetime import datetime
 from tkinter import simpledialog, messagebox
-from PIL import Image, ImageTk
-from matplotlib.path import Path
+from PIL import ImageTk
+from classes.plan_canvas import PlanCanvas
+from classes.project_archive import ProjectArchive
+from classes.session_journal import SessionJournal
 from utils.hanan_utils import annotations_to_hanan_grid
+from utils.project_utils import save_project, save_project_archive
+from utils.room_utils import assign_room, count_in_polygon
+from utils.render_utils import render_lattice
 
 
 class RoomAnnotator(tk.Frame):
@@ -21,9 +28,9 @@ class RoomAnnotator(tk.Frame):
         self.v_scroll = tk.Scrollbar(self.canvas_frame, orient="vertical")
         self.v_scroll.pack(side="right", fill="y")
 
-        self.canvas = tk.Canvas(self.canvas_frame, bg="white",
-                                xscrollcommand=self.h_scroll.set,
-                                yscrollcommand=self.v_scroll.set)
+        self.canvas = PlanCanvas(self.canvas_frame, bg="white",
+                                 xscrollcommand=self.h_scroll.set,
+                                 yscrollcommand=self.v_scroll.set)
         self.canvas.pack(side="left", fill="both", expand=True)
 
         self.h_scroll.config(command=self.canvas.xview)
@@ -32,17 +39,19 @@ class RoomAnnotator(tk.Frame):
         
        
        
-        self.image = Image.open(self.container['image_path'])
-        self.img_tk = ImageTk.PhotoImage(self.image)
-        self.canvas.create_image(0, 0, anchor="nw", image=self.img_tk)
+        self.canvas.set_background(self.container['image'].pyramid())
+        self.lattice_tk = None
+        self.lattice_id = None
 
-        self.container['graph'], self.x_coords, self.y_coords, self.container['symbols'] = annotations_to_hanan_grid(self.container['symbols'], self.container['scale'], threshold=1000)
+        self.container['grid'], self.x_coords, self.y_coords, self.container['symbols'] = annotations_to_hanan_grid(self.container['symbols'], self.container['scale'], threshold=self.container['snap_threshold'])
         
         self.room_polygons = []
         self.current_polygon = []
         self.dot_room_map = {}
 
         self.canvas.bind("<Button-1>", self.on_click)
+        if self.container.get('grid_render', 'raster') != 'items':
+            self.canvas.on_view_change(self.draw_lattice)
 
         self.finish_button = tk.Button(self, text="Finish Room", command=self.finish_room)
         self.finish_button.pack()
@@ -54,33 +63,64 @@ class RoomAnnotator(tk.Frame):
         self.roomless_count_label.pack()
 
         self.draw_all()
+        # Rooms recovered from an autosaved session
+        for polygon, room_name in self.container.get('rooms', []):
+            self.close_room([tuple(p) for p in polygon], room_name)
+        self.container['rooms'] = self.room_polygons
         self.update_roomless_count()
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        self.canvas.update_scrollregion()
 
     def draw_all(self):
+        # In 'raster' mode the lattice is drawn by draw_lattice whenever the view changes
+        if self.container.get('grid_render', 'raster') == 'items':
+            self.draw_lattice_items()
+
+        grid = self.container['grid']
+        symbols = self.container['symbols']
+        for node in grid.dots():
+            x, y = node
+            is_panel = any(s.type == "electrical panel" for s in symbols.at(node))
+            if is_panel:
+                self.canvas.create_rectangle(x-5, y-5, x+5, y+5, fill="black", tags=f"dot_{x}_{y}")
+            else:
+                self.canvas.create_oval(x-3, y-3, x+3, y+3, fill="red", tags=f"dot_{x}_{y}")
+
+    def draw_lattice_items(self):
         for x in self.x_coords:
             self.canvas.create_line(x, min(self.y_coords), x, max(self.y_coords), fill="gray", dash=(2, 2))
         for y in self.y_coords:
             self.canvas.create_line(min(self.x_coords), y, max(self.x_coords), y, fill="gray", dash=(2, 2))
 
-        for node in self.container['graph'].nodes():
-            x, y = node
-            color = "red" if self.container['graph'].nodes[node].get("is_dot") else "blue"
+        grid = self.container['grid']
+        for node in grid.nodes():
+            if not grid.node_is_dot(node):
+                x, y = node
+                self.canvas.create_oval(x-3, y-3, x+3, y+3, fill="blue", tags=f"dot_{x}_{y}")
 
-            is_panel = any(s.coords == (x, y) and s.type == "electrical panel" for s in self.container['symbols'])
-            if is_panel:
-                self.canvas.create_rectangle(x-5, y-5, x+5, y+5, fill="black", tags=f"dot_{x}_{y}")
-            else:
-                self.canvas.create_oval(x-3, y-3, x+3, y+3, fill=color, tags=f"dot_{x}_{y}")
+    # === Raster lattice overlay ===
+
+    def draw_lattice(self):
+        """Re-renders the grid lattice for the visible part of the canvas at the current zoom"""
+        x0, y0, x1, y1 = (int(v) for v in self.canvas.viewport())
+        lattice = render_lattice(self.container['grid'], (x0, y0, x1, y1), zoom=self.canvas.zoom)
+        self.lattice_tk = ImageTk.PhotoImage(lattice)
+
+        if self.lattice_id is None:
+            self.lattice_id = self.canvas.create_overlay(x0, y0, self.lattice_tk, tags=("lattice",))
+        else:
+            self.canvas.coords(self.lattice_id, x0, y0)
+            self.canvas.itemconfig(self.lattice_id, image=self.lattice_tk)
+        # Right above the floor plan, below dots, rooms and labels
+        self.canvas.tag_lower(self.lattice_id)
+        self.canvas.tag_lower("background")
 
     def update_roomless_count(self):
-        roomless = sum(1 for s in self.container['symbols'] if s.room is None)
+        roomless = self.container['symbols'].count_in_room(None)
         self.roomless_count_label.config(text=f"Symbols without room: {roomless}")
 
     def on_click(self, event):
-        x = self.canvas.canvasx(event.x)
-        y = self.canvas.canvasy(event.y)
-        closest = min(self.container['graph'].nodes(), key=lambda n: (n[0]-x)**2 + (n[1]-y)**2)
+        x, y = self.canvas.plan_coords(event.x, event.y)
+        closest = self.container['grid'].nearest_node(x, y)
         self.current_polygon.append(closest)
         self.draw_polygon_preview()
 
@@ -95,8 +135,6 @@ class RoomAnnotator(tk.Frame):
         if len(self.current_polygon) < 3:
             return
 
-        # Convert list of (x, y) to flat list of coords
-        flat_coords = [coord for point in self.current_polygon for coord in point]
         room_name = simpledialog.askstring("Room Name", "Enter name for this room:", parent=self)
         if not room_name:
             return
@@ -106,24 +144,14 @@ class RoomAnnotator(tk.Frame):
         isValid = self.valid_polygon()
         print(isValid)
         if isValid:
-            self.room_polygons.append((self.current_polygon[:], room_name))
-            self.assign_room_to_dots(self.current_polygon, room_name)
-
-            cx = sum(x for x, y in self.current_polygon) // len(self.current_polygon)
-            cy = sum(y for x, y in self.current_polygon) // len(self.current_polygon)
-            self.canvas.create_text(cx, cy, text=room_name, fill="black", font=("Arial", 10, "bold"))
+            self.close_room(self.current_polygon[:], room_name)
+            journal = self.container.get('journal')
+            if journal is not None:
+                journal.record("room", name=room_name, polygon=[list(p) for p in self.current_polygon])
 
             self.current_polygon.clear()
             self.canvas.delete("preview")
             self.update_roomless_count()
-                    # Draw filled polygon with light green fill (simulate transparency)
-            self.canvas.create_polygon(
-                flat_coords,
-                fill="",  # light green with low opacity hex (simulated)
-                outline="green",
-                width=2,
-                tags="room_polygon"
-            )
         else:
             self.current_polygon.clear()
             self.canvas.delete("preview")
@@ -131,36 +159,58 @@ class RoomAnnotator(tk.Frame):
             return
 
 
+    def close_room(self, polygon, room_name):
+        """Assigns the symbols inside polygon to room_name and draws the room outline and label"""
+        self.room_polygons.append((polygon, room_name))
+        self.assign_room_to_dots(polygon, room_name)
+
+        cx = sum(x for x, y in polygon) // len(polygon)
+        cy = sum(y for x, y in polygon) // len(polygon)
+        self.canvas.create_text(cx, cy, text=room_name, fill="black", font=("Arial", 10, "bold"))
+        # Draw filled polygon with light green fill (simulate transparency)
+        self.canvas.create_polygon(
+            [coord for point in polygon for coord in point],
+            fill="",  # light green with low opacity hex (simulated)
+            outline="green",
+            width=2,
+            tags="room_polygon"
+        )
+
     def done(self):
+        self.container['rooms'] = list(self.room_polygons)
+        self.save_project_to_json()
+        journal = self.container.get('journal')
+        if journal is not None:
+            # Saved: nothing left to recover
+            journal.close()
+            SessionJournal.discard(journal.directory)
+            self.container['journal'] = None
         self.pack_forget() 
         self.on_done(self.container)
 
+    def save_project_to_json(self):
+        """Saves the snapped symbols with their rooms and the room outlines, for reopening or batch runs"""
+        os.makedirs("output", exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join("output", f"project_{self.container['image_name']}_{timestamp}.json")
+        save_project(path, self.container['symbols'], self.container['scale'], self.container['rooms'])
+        print(f"✅ Project with rooms saved to {os.path.abspath(path)}")
+
+        # Binary copy that also keeps the grid, so the project reopens without re-snapping
+        archive = os.path.splitext(path)[0] + ProjectArchive.EXTENSION
+        save_project_archive(archive, self.container['symbols'], self.container['scale'],
+                             self.container['rooms'], self.container['grid'])
+
     def assign_room_to_dots(self, polygon, room_name):
-        poly_path = Path(polygon)
-        for node in self.container['graph'].nodes():
-            if self.container['graph'].nodes[node].get("is_dot"):
-                if poly_path.contains_point(node, radius=1e-6):
-                    self.dot_room_map[node] = room_name
-                    self.canvas.itemconfig(f"dot_{node[0]}_{node[1]}", fill="green")
-                    self.canvas.create_text(node[0]+5, node[1]-5, text=room_name, fill="black", font=("Arial", 8))
-
-        for symbol in self.container['symbols']:
-            mapped = (int(symbol.coords[0]), int(symbol.coords[1]))
-            if symbol.type != "electrical panel" and mapped in self.dot_room_map and symbol.room is None:
-                symbol.room = self.dot_room_map[mapped]
+        nodes = assign_room(self.container['grid'], self.container['symbols'], polygon, room_name)
+        for node in nodes:
+            self.dot_room_map[node] = room_name
+            self.canvas.itemconfig(f"dot_{node[0]}_{node[1]}", fill="green")
+            self.canvas.create_text(node[0]+5, node[1]-5, text=room_name, fill="black", font=("Arial", 8))
     
     def valid_polygon(self):
-        poly_path = Path(self.current_polygon)
-        count = 0
-
-        for symbol in self.container["symbols"]:
-            if symbol.type == 'junction box':
-                if poly_path.contains_point((symbol.coords[0],symbol.coords[1]),radius = 1e-6):
-                    count+=1
-                    if count > 1:
-                        return False
-
-        return count == 1
+        junction_boxes = self.container["symbols"].of_type('junction box')
+        return count_in_polygon(junction_boxes, self.current_polygon) == 1
 
                         
         
@@ -0,0 +1,243 @@
+# server.py
+# Local HTTP/JSON routing and costing service for estimating tools (loopback only):
+#   python server.py --port 8765 --workers 4
+#
+# POST /route   {"scale", "symbols", "rooms", "routing"?}          -> wires, lengths, gauges and BOM
+#               {"projects": [{...}, ...], "routing"?}              -> {"results": [...]} (batched)
+# GET  /health
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import ROUTING, SERVICE
+from engine import solve, summarize
+from utils.project_utils import project_from_dict
+
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost")
+ROUTING_MODES = ("graph", "direct")
+TOPOLOGIES = ("star", "steiner")
+ROUTE_CACHE_DIR = os.path.join("output", "route_cache")
+
+
+def validate_routing(routing):
+    """
+    Raises:
+        ValueError: if the routing mode or topology is not one the engine knows
+    """
+    if routing.get("mode") not in ROUTING_MODES:
+        raise ValueError(f"routing mode must be one of {', '.join(ROUTING_MODES)}, not {routing.get('mode')!r}")
+    if routing.get("topology") not in TOPOLOGIES:
+        raise ValueError(f"topology must be one of {', '.join(TOPOLOGIES)}, not {routing.get('topology')!r}")
+
+
+def validate_project(raw):
+    """
+    Checks the shape of one project payload before anything is built from it
+
+    Raises:
+        ValueError: if the payload is not an object, has no symbols, or has no numeric scale
+    """
+    if not isinstance(raw, dict):
+        raise ValueError("project must be a JSON object")
+    if not isinstance(raw.get("symbols"), list) or not raw["symbols"]:
+        raise ValueError("project has no symbols")
+    scale = raw.get("scale")
+    if isinstance(scale, bool) or not isinstance(scale, (int, float)) or scale <= 0:
+        raise ValueError(f"scale must be a positive number, not {scale!r}")
+    if not isinstance(raw.get("rooms", []), list):
+        raise ValueError("rooms must be a list")
+
+
+def solve_request(raw, routing):
+    """
+    Routes and costs one project; runs in a worker process
+
+    Returns:
+        summary(dict): engine.summarize's result plus the seconds spent per step in "timings"
+    """
+    validate_project(raw)
+    start = time.perf_counter()
+    project = project_from_dict(raw)
+    parse = time.perf_counter() - start
+
+    result = solve(project, routing, cache_dir=ROUTE_CACHE_DIR)
+    summary = summarize(result)
+    summary["timings"] = dict(result["timings"], parse=parse)
+    return summary
+
+
+class RoutingService:
+    def __init__(self, workers=2, cache_entries=64):
+        """
+        Runs routing requests on a process pool and keeps the latest results in
+        memory, keyed by the request content, so repeated requests (an
+        estimator re-opening the same project) are answered without routing.
+
+        Class parameters:
+        workers, cache_entries
+        """
+        self.workers = workers
+        self.cache_entries = cache_entries
+        self._pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def request_key(raw, routing):
+        content = {"project": raw, "routing": routing}
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+    def _cached(self, key):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        return None
+
+    def _store(self, key, summary):
+        with self._lock:
+            self._cache[key] = summary
+            if len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+
+    def route(self, projects, routing):
+        """
+        Routes a batch of projects; cache misses are dispatched to the pool together
+
+        Args:
+            projects([dict]): project payloads ({"scale", "symbols", "rooms"})
+            routing(dict): routing options shared by the batch
+        Returns:
+            results([dict]): one summary (or {"error"}) per project, in order
+            hits(int): number of projects answered from the cache
+            timings({str: float}): seconds spent per step, summed over the routed projects
+        """
+        keys = [self.request_key(raw, routing) for raw in projects]
+        results = [self._cached(key) for key in keys]
+        hits = sum(r is not None for r in results)
+
+        pending = {}
+        for i, (raw, key) in enumerate(zip(projects, keys)):
+            if results[i] is None:
+                if self._pool is not None:
+                    pending[i] = self._pool.submit(solve_request, raw, routing)
+                else:
+                    pending[i] = raw
+        timings = {}
+        for i, job in pending.items():
+            try:
+                results[i] = job.result() if self._pool is not None else solve_request(job, routing)
+            except ValueError as e:
+                results[i] = {"error": str(e)}
+                continue
+            except Exception as e:
+                # Anything else validate_project let through fails this project alone, not the batch
+                results[i] = {"error": f"invalid project: {type(e).__name__} {e}"}
+                continue
+            for step, seconds in results[i].pop("timings").items():
+                timings[step] = timings.get(step, 0.0) + seconds
+            self._store(keys[i], results[i])
+        return results, hits, timings
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+
+
+class RoutingRequestHandler(BaseHTTPRequestHandler):
+    service = None  # RoutingService, set by serve()
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok", "workers": self.service.workers})
+        else:
+            self._send(404, {"error": f"unknown endpoint {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/route":
+            self._send(404, {"error": f"unknown endpoint {self.path}"})
+            return
+
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            routing = dict(ROUTING)
+            routing.update(body.get("routing", {}))
+            routing["workers"] = 0  # requests already run in the service's pool
+            batch = "projects" in body
+            projects = body["projects"] if batch else [body]
+            validate_routing(routing)
+        except (ValueError, TypeError, AttributeError) as e:
+            self._send(400, {"error": f"invalid request: {e}"})
+            return
+        read = time.perf_counter() - start
+
+        try:
+            results, hits, timings = self.service.route(projects, routing)
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+            return
+        total = time.perf_counter() - start
+
+        # Server-Timing: request reading, the per-step worker times summed over the batch, wall time
+        steps = dict({"read": read}, **timings, total=total)
+        headers = {
+            "Server-Timing": ", ".join(f"{step};dur={seconds * 1000:.1f}" for step, seconds in steps.items()),
+            "X-Cache": f"hits={hits}; misses={len(projects) - hits}",
+        }
+
+        if batch:
+            self._send(200, {"results": results}, headers)
+        elif "error" in results[0]:
+            self._send(400, results[0], headers)
+        else:
+            self._send(200, results[0], headers)
+
+    def _send(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def serve(host=SERVICE['host'], port=SERVICE['port'], workers=SERVICE['workers'], cache_entries=SERVICE['cache_entries']):
+    """Runs the service until interrupted; only loopback addresses are accepted"""
+    if host not in LOOPBACK_HOSTS:
+        raise ValueError(f"the routing service only listens on loopback, not {host}")
+
+    RoutingRequestHandler.service = RoutingService(workers, cache_entries)
+    server = ThreadingHTTPServer((host, port), RoutingRequestHandler)
+    print(f"🔌 Routing service listening on http://{host}:{port} with {workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        RoutingRequestHandler.service.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON harness routing and costing service.")
+    parser.add_argument("--host", default=SERVICE['host'], choices=LOOPBACK_HOSTS)
+    parser.add_argument("--port", type=int, default=SERVICE['port'])
+    parser.add_argument("-j", "--workers", type=int, default=SERVICE['workers'])
+    parser.add_argument("--cache-entries", type=int, default=SERVICE['cache_entries'])
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.workers, args.cache_entries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# service_check.py
+# Routing service regression check: starts the service on a free loopback port and posts a batch
+# holding a good project next to malformed ones, and fails unless only the malformed ones get an error.
+#   python service_check.py
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+from benchmarks.synthetic import project_of_size
+from server import RoutingRequestHandler, RoutingService
+from utils.project_utils import project_to_dict
+
+
+def post(url, payload):
+    """
+    Returns:
+        status(int): HTTP status of the response
+        body(dict): decoded JSON body
+    """
+    request = urllib.request.Request(url, json.dumps(payload).encode(), {"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def check():
+    """
+    Returns:
+        failures([str]): unexpected responses, empty when the check passes
+    """
+    project = project_of_size(20)
+    good = project_to_dict(project["symbols"], project["scale"], project["rooms"])
+    bad = {
+        "no symbols": dict(good, symbols=[]),
+        "text scale": dict(good, scale="0.05"),
+        "not an object": [good],
+    }
+
+    RoutingRequestHandler.service = RoutingService(workers=0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RoutingRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/route"
+    failures = []
+    try:
+        status, body = post(url, {"projects": [good] + list(bad.values())})
+        if status != 200:
+            failures.append(f"batch answered {status}: {body}")
+        else:
+            results = body["results"]
+            if "error" in results[0]:
+                failures.append(f"good project failed: {results[0]['error']}")
+            for name, result in zip(bad, results[1:]):
+                if "error" not in result:
+                    failures.append(f"{name} project was routed")
+                else:
+                    print(f"   {name}: {result['error']}")
+
+        status, body = post(url, bad["no symbols"])
+        if status != 400:
+            failures.append(f"single project with no symbols answered {status}, not 400")
+        status, body = post(url, dict(good, routing={"mode": "fastest"}))
+        if status != 400:
+            failures.append(f"unknown routing mode answered {status}, not 400")
+    finally:
+        server.shutdown()
+        server.server_close()
+        RoutingRequestHandler.service.shutdown()
+    return failures
+
+
+def main():
+    failures = check()
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ Malformed projects fail alone")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,8 +1,10 @@
 import tkinter as tk
 from tkinter import simpledialog, messagebox, filedialog
-from PIL import Image, ImageTk
+from classes.image_service import ImageService
+from classes.plan_canvas import PlanCanvas
+from classes.session_journal import SessionJournal
 from classes.symbol import Symbol
-import json
+from utils.project_utils import load_project, project_from_dict, project_to_dict, save_project
 import os
 from datetime import datetime
 import re
@@ -23,6 +25,7 @@ class SymbolAnnotator(tk.Frame):
         self.defaults = self.container.get('default', {})
         self.scale_point_ids = []
         self.active_switch = None
+        self._drawn = {}  # symbol id -> what its canvas items show, see refresh_canvas
 
         # --- Top controls ---
         ctrl = tk.Frame(self)
@@ -40,8 +43,8 @@ class SymbolAnnotator(tk.Frame):
         canvas_frame.pack(fill="both", expand=True)
         h_scroll = tk.Scrollbar(canvas_frame, orient="horizontal"); h_scroll.pack(side="bottom", fill="x")
         v_scroll = tk.Scrollbar(canvas_frame, orient="vertical"); v_scroll.pack(side="right", fill="y")
-        self.canvas = tk.Canvas(canvas_frame, bg="white",
-                                xscrollcommand=h_scroll.set, yscrollcommand=v_scroll.set)
+        self.canvas = PlanCanvas(canvas_frame, bg="white",
+                                 xscrollcommand=h_scroll.set, yscrollcommand=v_scroll.set)
         self.canvas.pack(side="left", fill="both", expand=True)
         h_scroll.config(command=self.canvas.xview); v_scroll.config(command=self.canvas.yview)
 
@@ -58,8 +61,6 @@ class SymbolAnnotator(tk.Frame):
         self.canvas.bind("<Button-1>", self.click_event)
 
         # --- State holders ---
-        self.img_tk = None
-        self.img_id = None
         self.scale_points = []
         self.scale_set = False
 
@@ -73,19 +74,19 @@ class SymbolAnnotator(tk.Frame):
 
         if not path:
             return
+        self.container["image"] = ImageService(path, self.container['image_tiles'])
         self.container["image_path"] = path
-        self.container["image_name"] = os.path.basename(path).split('.')[0]
-        img = Image.open(path)
-        self.img_tk = ImageTk.PhotoImage(img)
-
-        if self.img_id:
-            self.canvas.delete(self.img_id)
-        self.img_id = self.canvas.create_image(0, 0, anchor="nw",
-                                            image=self.img_tk,
-                                            tags=("background",))
-        self.canvas.config(scrollregion=(0, 0,
-                                        self.img_tk.width(),
-                                        self.img_tk.height()))
+        self.container["image_name"] = self.container["image"].image_name
+        self.canvas.set_background(self.container["image"].pyramid())
+
+        # === Offer to recover an autosaved session of this image ===
+        journal_dir = os.path.join(self.container['autosave']['directory'], self.container["image_name"])
+        if SessionJournal.exists(journal_dir):
+            if messagebox.askyesno("Recover?", "An autosaved session exists for this image. Recover it?"):
+                self.recover_session(journal_dir)
+                return
+            SessionJournal.discard(journal_dir)
+        self.start_journal(journal_dir)
 
         # === Ask if user wants to resume ===
         if messagebox.askyesno("Continue?", "Load previous annotations?"):
@@ -95,29 +96,13 @@ class SymbolAnnotator(tk.Frame):
             )
             if json_path:
                 try:
-                    with open(json_path, "r") as f:
-                        raw = json.load(f)
-
-                    self.container["symbols"].clear()
-                    # First pass: load all symbols
-                    symbols_raw = raw.get("symbols", [])
-                    symbols = [Symbol.from_dict(entry) for entry in symbols_raw]
                     self.container["symbols"].clear()
-                    self.container["symbols"].extend(symbols)
+                    project = load_project(json_path, registry=self.container["symbols"])
 
-                    # Second pass: link switch.controls
-                    id_map = {s.id: s for s in symbols}
-                    for entry in symbols_raw:
-                        if entry["type"] == "switch":
-                            switch = id_map[entry["id"]]
-                            control_ids = entry.get("controls", [])
-                            switch.controls = [id_map[cid] for cid in control_ids if cid in id_map]
+                    # Draw symbols and switch connections on canvas in one pass
+                    self.refresh_canvas()
 
-                    # Draw symbols on canvas
-                    for sym in self.container["symbols"]:
-                        self.draw_symbol(sym)
-
-                    self.container["scale"] = raw.get("scale", None)
+                    self.container["scale"] = project["scale"]
                     self.scale_set = self.container["scale"] is not None
 
                     if not self.scale_set:
@@ -125,6 +110,7 @@ class SymbolAnnotator(tk.Frame):
                         self.begin_scale_collection()
 
                     self.update_annotation_list()
+                    self.container['journal'].compact()
                     print(f"✅ Loaded {len(self.container['symbols'])} annotations.")
                     return
                 except Exception as e:
@@ -134,6 +120,36 @@ class SymbolAnnotator(tk.Frame):
 
 
 
+    def start_journal(self, journal_dir):
+        if self.container.get('journal') is not None:
+            self.container['journal'].close()
+        options = self.container['autosave']
+        self.container['journal'] = SessionJournal(journal_dir, self.session_state,
+                                                   flush_interval=options['flush_interval'],
+                                                   compact_every=options['compact_every'])
+
+    def session_state(self):
+        return project_to_dict(self.container["symbols"], self.container.get("scale"), self.container.get("rooms", []))
+
+    def record(self, op, **fields):
+        """Appends an edit to the session journal"""
+        if self.container.get('journal') is not None:
+            self.container['journal'].record(op, **fields)
+
+    def recover_session(self, journal_dir):
+        self.container["symbols"].clear()
+        project = project_from_dict(SessionJournal.replay(journal_dir), registry=self.container["symbols"])
+        self.container["scale"] = project["scale"]
+        self.container["rooms"] = project["rooms"]
+        self.scale_set = self.container["scale"] is not None
+        self.start_journal(journal_dir)
+
+        self.refresh_canvas()
+        self.update_annotation_list()
+        print(f"✅ Recovered {len(self.container['symbols'])} annotations from the autosave journal.")
+        if not self.scale_set:
+            self.begin_scale_collection()
+
     def begin_scale_collection(self):
         self.scale_points.clear()
         self.scale_set = False
@@ -143,8 +159,7 @@ class SymbolAnnotator(tk.Frame):
         self.canvas.bind("<Button-1>", self.collect_scale_point)
 
     def collect_scale_point(self, event):
-        x = self.canvas.canvasx(event.x)
-        y = self.canvas.canvasy(event.y)
+        x, y = self.canvas.plan_coords(event.x, event.y)
         self.scale_points.append((x, y))
         dot = self.canvas.create_oval(x-3, y-3, x+3, y+3,
                                       outline="blue", width=2)
@@ -165,6 +180,7 @@ class SymbolAnnotator(tk.Frame):
             scale = real / pixel_dist
             self.container['scale'] = scale
             self.scale_set = True
+            self.record("scale", scale=scale)
             self.status_var.set(f"Scale set: {scale:.4f} ft/pixel")
         else:
             self.status_var.set("Invalid scale. Reload image to retry.")
@@ -185,16 +201,14 @@ class SymbolAnnotator(tk.Frame):
         if not self.scale_set:
             return
 
-        x = self.canvas.canvasx(event.x)
-        y = self.canvas.canvasy(event.y)
+        x, y = self.canvas.plan_coords(event.x, event.y)
 
         # Check for click on existing symbol first
         R = 6  # pick radius slightly larger than symbol
-        for sym in self.container["symbols"]:
-            sx, sy = sym.coords
-            if (x - sx)**2 + (y - sy)**2 <= R*R:
-                self.open_edit_dialog_for(sym)
-                return
+        hit = self.container["symbols"].nearest(x, y, R)
+        if hit is not None:
+            self.open_edit_dialog_for(hit)
+            return
 
         # Otherwise add a new symbol
         stype = self.selected_symbol.get()
@@ -205,6 +219,7 @@ class SymbolAnnotator(tk.Frame):
 
         if stype.lower() == "switch":
             self.container["symbols"].append(sym)
+            self.record("add", symbol=sym.to_dict())
             self.active_switch = sym
             self.selected_symbol.set("light")
             self.status_var.set("Now click the lights this switch controls.")
@@ -214,15 +229,15 @@ class SymbolAnnotator(tk.Frame):
                 return
             self.active_switch.controls.append(sym)
             self.container["symbols"].append(sym)
-            sx, sy = self.active_switch.coords
-            self.canvas.create_line(sx, sy, x, y,
-                                    fill="blue", dash=(2,2),
-                                    tags=("connection",))
+            self.record("add", symbol=sym.to_dict())
+            self.record("link", switch=self.active_switch.id, light=sym.id)
+            self.redraw_symbol(self.active_switch)
         else:
             self.container["symbols"].append(sym)
+            self.record("add", symbol=sym.to_dict())
             self.active_switch = None
 
-        self.draw_symbol(sym)
+        self.redraw_symbol(sym)
         self.update_annotation_list()
 
     def draw_symbol(self, symbol):
@@ -248,16 +263,17 @@ class SymbolAnnotator(tk.Frame):
     def update_annotation_list(self):
         self.annotation_listbox.delete(0, tk.END)
         sel = self.selected_symbol.get()
-        for sym in self.container["symbols"]:
-            if sym.type == sel:
-                ctrl = ""
-                if sym.type.lower() == "switch" and sym.controls:
-                    pts = [f"({int(l.coords[0])},{int(l.coords[1])})" for l in sym.controls]
-                    ctrl = " -> " + ", ".join(pts)
-                txt = (f"{sym.type} (ID:{sym.id}) at "
-                       f"({int(sym.coords[0])}, {int(sym.coords[1])}) | "
-                       f"Amperage: {sym.amperage} | Height: {sym.height}{ctrl}")
-                self.annotation_listbox.insert(tk.END, txt)
+        rows = []
+        for sym in self.container["symbols"].of_type(sel):
+            ctrl = ""
+            if sym.type.lower() == "switch" and sym.controls:
+                pts = [f"({int(l.coords[0])},{int(l.coords[1])})" for l in sym.controls]
+                ctrl = " -> " + ", ".join(pts)
+            txt = (f"{sym.type} (ID:{sym.id}) at "
+                   f"({int(sym.coords[0])}, {int(sym.coords[1])}) | "
+                   f"Amperage: {sym.amperage} | Height: {sym.height}{ctrl}")
+            rows.append(txt)
+        self.annotation_listbox.insert(tk.END, *rows)
 
     def open_edit_dialog_for(self, sym):
         dlg = tk.Toplevel(self)
@@ -292,7 +308,9 @@ class SymbolAnnotator(tk.Frame):
         def save():
             try:
                 newx = float(xvar.get()); newy = float(yvar.get())
-                sym.coords = (newx, newy)
+                if (newx, newy) != tuple(sym.coords):
+                    sym.coords = (newx, newy)
+                    self.record("move", id=sym.id, coords=[newx, newy])
             except ValueError:
                 messagebox.showerror("Invalid input", "Coordinates must be numbers.")
                 return
@@ -308,6 +326,8 @@ class SymbolAnnotator(tk.Frame):
                 except ValueError:
                     messagebox.showerror("Invalid input", "Height must be integer.")
                     return
+            if amps_var or hgt_var:
+                self.record("edit", id=sym.id, fields={"amperage": sym.amperage, "height": sym.height})
             self.refresh_canvas()
             self.update_annotation_list()
             dlg.destroy()
@@ -329,41 +349,44 @@ class SymbolAnnotator(tk.Frame):
             sym.controls.clear()
         try:
             self.container["symbols"].remove(sym)
+            self.record("delete", id=sym.id)
         except ValueError:
             pass
         self.refresh_canvas()
         self.update_annotation_list()
 
+    @staticmethod
+    def drawn_state(sym):
+        """What a symbol's canvas items depend on: its type, position and, for a switch, its lights' positions"""
+        lights = tuple(tuple(lt.coords) for lt in sym.controls) if sym.type.lower() == "switch" else ()
+        return sym.type, tuple(sym.coords), lights
+
+    def erase_symbol(self, symbol_id):
+        self.canvas.delete(f"id_{symbol_id}")
+        self.canvas.delete(f"connection_{symbol_id}")
+        self._drawn.pop(symbol_id, None)
+
+    def redraw_symbol(self, sym):
+        """Replaces a symbol's canvas items (and a switch's connection lines) through their tags"""
+        self.erase_symbol(sym.id)
+        if sym.type.lower() == "switch":
+            sx, sy = sym.coords
+            for lt in sym.controls:
+                lx, ly = lt.coords
+                self.canvas.create_line(sx, sy, lx, ly,
+                                        fill="blue", dash=(2,2),
+                                        tags=("connection", f"connection_{sym.id}"))
+        self.draw_symbol(sym)
+        self._drawn[sym.id] = self.drawn_state(sym)
+
     def refresh_canvas(self):
-        # Remove only symbols & connections
-        self.canvas.delete("symbol")
-        self.canvas.delete("connection")
-        for sym in self.container["symbols"]:
-            if sym.type.lower() == "switch":
-                sx, sy = sym.coords
-                for lt in sym.controls:
-                    lx, ly = lt.coords
-                    self.canvas.create_line(sx, sy, lx, ly,
-                                            fill="blue", dash=(2,2),
-                                            tags=("connection",))
-            x, y = sym.coords
-            tag = ("symbol", f"id_{sym.id}")
-            t = sym.type.lower()
-            if t == 'outlet':
-                self.canvas.create_oval(x-3, y-3, x+3, y+3,
-                                        fill="red", tags=tag)
-            elif t == 'switch':
-                self.canvas.create_oval(x-3, y-3, x+3, y+3,
-                                        fill="red", tags=tag)
-            elif t == 'light':
-                self.canvas.create_oval(x-3, y-3, x+3, y+3,
-                                        fill="yellow", tags=tag)
-            elif t == 'junction box':
-                self.canvas.create_rectangle(x-8, y-8, x+8, y+8,
-                                             fill="red", tags=tag)
-            elif t == 'electrical panel':
-                self.canvas.create_rectangle(x-5, y-15, x+5, y+15,
-                                             fill="black", tags=tag)
+        # Tk has no bulk create, so only items whose symbol was added, moved, edited or deleted are redrawn
+        symbols = self.container["symbols"]
+        for symbol_id in [i for i in self._drawn if symbols.get(i) is None]:
+            self.erase_symbol(symbol_id)
+        for sym in symbols:
+            if self._drawn.get(sym.id) != self.drawn_state(sym):
+                self.redraw_symbol(sym)
 
     def finish_light_selection(self):
         if self.active_switch:
@@ -378,12 +401,7 @@ class SymbolAnnotator(tk.Frame):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"annotations_{str(self.container["image_name"])}_{timestamp}.json"
         path = os.path.join("output", filename)
-        data = {
-            "scale": self.container.get("scale", 1.0),  # default to 1.0 if not set
-            "symbols": [s.to_dict() for s in self.container["symbols"]]
-        }
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2)
+        save_project(path, self.container["symbols"], self.container.get("scale", 1.0))  # default to 1.0 if not set
         print(f"✅ Annotations saved to {os.path.abspath(path)}")
 
     def finish(self):
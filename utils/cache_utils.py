@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+
+
+def route_cache_key(grid, pairs_by_room, scale, routing):
+    """
+    Content hash of everything the routed paths depend on
+
+    Args:
+        grid(HananGrid): grid the paths are routed on
+        pairs_by_room({str: [((int,int),(int,int))]}): snapped (source, target) pairs per room
+        scale(float): ft/pixel scale of the plan
+        routing(dict): routing options (mode, topology, ...)
+    Returns:
+        key(str): hex digest identifying the routing problem
+    """
+    content = {
+        "x_coords": grid.x_coords.tolist(),
+        "y_coords": grid.y_coords.tolist(),
+        "blocked": sorted(grid.blocked),
+        "pairs": [[room, [[list(s), list(t)] for s, t in pairs]] for room, pairs in pairs_by_room.items()],
+        "scale": scale,
+        "mode": routing.get("mode"),
+        "topology": routing.get("topology"),
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+def encode_routes(room_routes):
+    """
+    Converts routed paths into the JSON form stored in the cache; the grid is
+    part of the key, so it is not stored
+
+    Args:
+        room_routes({str: [[(int,int)] | None]}): paths per room
+    Returns:
+        entry(dict): flattened paths per room
+    """
+    return {
+        "routes": {room: [None if path is None else [c for node in path for c in node] for path in paths]
+                   for room, paths in room_routes.items()},
+    }
+
+
+def decode_routes(entry):
+    """
+    Inverse of encode_routes
+
+    Returns:
+        room_routes({str: [[(int,int)] | None]}): paths per room
+    """
+    return {room: [None if flat is None else list(zip(flat[::2], flat[1::2])) for flat in paths]
+            for room, paths in entry["routes"].items()}
+
+
+class RouteCache:
+    def __init__(self, directory, max_bytes):
+        """
+        Content-addressed on-disk cache of routed projects, one JSON file per key.
+        File modification times track use, and the least recently used entries
+        are evicted once the directory grows past max_bytes.
+
+        Class parameters:
+        directory, max_bytes
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)  # mark as recently used
+        return entry
+
+    def put(self, key, entry):
+        path = self._path(key)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self):
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:  # evicted by another process sharing the cache
+                    continue
+                files.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in files)
+        for _, size, name in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total -= size
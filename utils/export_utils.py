@@ -0,0 +1,267 @@
+import csv
+import json
+import re
+from collections import defaultdict, namedtuple
+from itertools import groupby
+
+from classes.wiring_model import PANEL_CONNECTIONS
+
+BUFFER_SIZE = 1 << 16
+
+# One wire of the project, flattened for export
+ExportRow = namedtuple("ExportRow", [
+    "room", "wire_id", "start_type", "start_id", "start_room", "start_xy",
+    "end_type", "end_id", "end_room", "end_xy", "amperage", "length", "gauge",
+])
+
+BOM_CSV_HEADER = ["Room", "Device Type", "Amperage", "Length (ft)", "Wire Gauge"]
+INSTRUCTIONS_CSV_HEADER = ["Room", "Device Type", "Start (x,y)", "End (x,y)", "Wire Gauge", "Length (ft)"]
+
+
+def export_rows(paths_by_room):
+    """
+    Walks every wire of the project once and flattens it into a sorted table:
+    room wires by room name, then the home runs, each by wire endpoints
+
+    Args:
+        paths_by_room({str: [{Symbol: Wire}]}): wires per room plus the home runs
+    Returns:
+        rows([ExportRow]): one row per wire
+    """
+    rows = []
+    for room, device_path_list in paths_by_room.items():
+        for device_path in device_path_list:
+            for wire in device_path.values():
+                start, end = wire.start_symbol, wire.end_symbol
+                rows.append(ExportRow(
+                    room, wire.id, start.type, start.id, start.room, tuple(int(c) for c in start.coords),
+                    end.type, end.id, end.room, tuple(int(c) for c in end.coords),
+                    wire.amperage, wire.length, wire.gauge,
+                ))
+    rows.sort(key=lambda r: (r.room == PANEL_CONNECTIONS, str(r.room), r.start_id, r.end_id, r.wire_id))
+    return rows
+
+
+def bill_of_materials(rows, room_count, panel_max_amp, unit_prices):
+    """
+    Bill of materials from the flat wire table
+
+    Args:
+        rows([ExportRow]): export_rows's table
+        room_count(int): number of rooms, one breaker each
+        panel_max_amp(float): total load on the panel
+        unit_prices({str: float}): price per ft of each wire gauge
+    Returns:
+        grand_total(float), table_rows([(int, str, float, float, float)]): level, material,
+            quantity, unit cost and total cost of every BOM line
+    """
+    wire_totals = defaultdict(float)
+    junction_box_counts = 0
+    for row in rows:
+        wire_totals[row.gauge] += row.length
+        if row.start_type == "junction box":
+            junction_box_counts += 1
+
+    # === Prepare table rows
+    table_rows = []
+    grand_total = 0.0
+
+    # Wires
+    for gauge, total_len in wire_totals.items():
+        unit_price = unit_prices.get(gauge, 0.00)
+        cost = round(total_len * unit_price, 2)
+        grand_total += cost
+        table_rows.append((1, f"{gauge} wire", round(total_len, 2), unit_price, cost))
+
+    # Junction Boxes
+    jb_unit_cost = 5.00
+    jb_total = junction_box_counts * jb_unit_cost
+    grand_total += jb_total
+    table_rows.append((0, "Junction Box", junction_box_counts, jb_unit_cost, jb_total))
+
+    # Breakers
+    breaker_unit_cost = 65.00
+    breaker_total = room_count * breaker_unit_cost
+    grand_total += breaker_total
+    table_rows.append((0, "20A Breaker GFCI/AFCI", room_count, breaker_unit_cost, breaker_total))
+
+    # Electrical Panel
+    if panel_max_amp <= 150:
+        panel_cost = 100
+        panel_label = "100-150A Electrical Panel"
+    else:
+        panel_cost = 200
+        panel_label = "200A Electrical Panel"
+    table_rows.append((0, panel_label, 1, panel_cost, panel_cost))
+    grand_total += panel_cost
+
+    return grand_total, table_rows
+
+
+# === Generators (one line / record at a time) ===
+
+def latex_escape(text):
+    return re.sub(r'_', r'\_', str(text))
+
+
+def bom_latex_lines(grand_total, table_rows):
+    yield from [
+        r"\documentclass{article}",
+        r"\usepackage{booktabs}",
+        r"\usepackage{graphicx}",
+        r"\usepackage{geometry}",
+        r"\geometry{margin=1in}",
+        r"\begin{document}",
+        r"\begin{center}",
+        r"\includegraphics[width=0.3\textwidth]{logo.png}\\[1em]",
+        r"{\LARGE \textbf{Bill of Materials Summary}}\\[0.5em]",
+        r"\end{center}",
+        r"\vspace{1.5em}",
+        r"\section*{Component Summary}",
+        r"\begin{tabular}{lllll}",
+        r"\toprule",
+        r"\textbf{BoM Level} & \textbf{Material} & \textbf{Quantity} & \textbf{Unit Cost (\$)} & \textbf{Total Cost (\$)} \\",
+        r"\midrule"
+    ]
+    for level, name, qty, unit, total in table_rows:
+        yield f"{level} & {name} & {qty} & {unit:.2f} & {total:.2f} \\\\"
+    yield from [
+        r"\bottomrule",
+        r"\end{tabular}",
+        "",
+        rf"\section*{{Total Cost: \${grand_total:.2f}}}",
+        r"\end{document}"
+    ]
+
+
+def instructions_latex_lines(rows):
+    """Cutting, stripping and connection instructions, section by section over the flat table"""
+    room_rows = [r for r in rows if r.room != PANEL_CONNECTIONS]
+    home_runs = [r for r in rows if r.room == PANEL_CONNECTIONS]
+
+    yield from [
+        r"\documentclass{article}",
+        r"\usepackage{geometry}",
+        r"\usepackage{enumitem}",
+        r"\usepackage{titlesec}",
+        r"\geometry{margin=1in}",
+        r"\titleformat{\section}{\normalfont\Large\bfseries}{\thesection}{1em}{}",
+        r"\begin{document}",
+        r"\begin{center}",
+        r"\LARGE \textbf{Wiring Harness Manufacturing Instructions}",
+        r"\end{center}",
+        r"\vspace{1em}",
+    ]
+
+    # === CUTTING SECTION ===
+    yield r"\section*{Cutting Instructions}"
+    for room, group in groupby(room_rows, key=lambda r: r.room):
+        yield fr"\subsection*{{Room: {latex_escape(room)}}}"
+        yield r"\begin{enumerate}[leftmargin=*]"
+        for r in group:
+            yield (fr"\item Cut \textbf{{{round(r.length, 2)}}} ft of \textbf{{{r.gauge}}} wire labeled \texttt{{{r.wire_id}}}.\\"
+                   fr"Connect from \texttt{{{r.start_type} (ID: {r.start_id})}} to {r.end_type} \texttt{{ID: {r.end_id}}}.")
+        yield r"\end{enumerate}"
+
+    # Home Run Cutting
+    if home_runs:
+        yield r"\subsection*{Home Run Wires}"
+        yield r"\begin{enumerate}[leftmargin=*]"
+        for r in home_runs:
+            yield (fr"\item Cut \textbf{{{round(r.length, 2)}}} ft of \textbf{{{r.gauge}}} wire labeled \texttt{{{r.wire_id}}}.\\"
+                   fr"Connect from junction box \texttt{{ID: {r.start_id}, Room: {r.start_room}}} "
+                   fr"to Electrical Panel \texttt{{ID: {r.end_id}}}.")
+        yield r"\end{enumerate}"
+
+    # === STRIPPING SECTION ===
+    yield r"\section*{Stripping Instructions}"
+    yield r"\begin{enumerate}[leftmargin=*]"
+    for r in rows:
+        yield (fr"\item Wire \texttt{{{r.wire_id}}}: Strip \texttt{{{r.start_type}}} end 0.5in, "
+               fr"Strip \texttt{{{r.end_type}}} end 0.5in.")
+    yield r"\end{enumerate}"
+
+    # === JUNCTION BOX CONNECTIONS ===
+    # Only wires ending at the junction box; light -> switch legs and daisy chain links end at a device
+    yield r"\section*{Junction Box Connections}"
+    junction_rows = (r for r in room_rows if r.end_type == "junction box")
+    for room, group in groupby(junction_rows, key=lambda r: r.room):
+        yield fr"\subsection*{{Room: {latex_escape(room)}}}"
+        yield r"\begin{enumerate}[leftmargin=*]"
+        for r in group:
+            yield fr"\item Connect wire \texttt{{{r.wire_id}}} to junction box \texttt{{ID: {r.end_id}, Room: {r.end_room}}}."
+        yield r"\end{enumerate}"
+
+    # === HOME RUN CONNECTIONS ===
+    yield r"\section*{Home Run Connections}"
+    yield r"\begin{enumerate}[leftmargin=*]"
+    for r in home_runs:
+        yield fr"\item Connect home run wire \texttt{{{r.wire_id}}} to junction box in Room \texttt{{{r.start_room}}} (ID: {r.start_id})."
+    yield r"\end{enumerate}"
+
+    # === ELECTRICAL PANEL CONNECTIONS ===
+    yield r"\section*{Electrical Panel Connections}"
+    yield r"\subsection*{Home Run to Breaker}"
+    yield r"\begin{enumerate}[leftmargin=*]"
+    for idx, r in enumerate(home_runs, start=1):
+        yield fr"\item Connect Home Run wire \texttt{{{r.wire_id}}} to breaker slot \#{idx}."
+    yield r"\end{enumerate}"
+
+    yield r"\subsection*{Breaker to Panel}"
+    yield r"\begin{enumerate}[leftmargin=*]"
+    for idx in range(1, len(home_runs) + 1):
+        yield fr"\item Connect breaker \#{idx} to Electrical Panel main bus."
+    yield r"\end{enumerate}"
+    yield r"\end{document}"
+
+
+def _number(value):
+    """15.0 -> 15, so amperages read as in the historical CSVs"""
+    return int(value) if value == value and float(value).is_integer() else value
+
+
+def bom_csv_rows(rows):
+    yield BOM_CSV_HEADER
+    for r in rows:
+        yield [r.room, r.start_type, _number(r.amperage), round(r.length, 2), r.gauge]
+
+
+def instructions_csv_rows(rows):
+    yield INSTRUCTIONS_CSV_HEADER
+    for r in rows:
+        yield [r.room, r.start_type, f"{r.start_xy[0]},{r.start_xy[1]}", f"{r.end_xy[0]},{r.end_xy[1]}",
+               r.gauge, round(r.length, 2)]
+
+
+def json_chunks(rows, grand_total, table_rows):
+    """The project as one JSON document, yielded wire by wire"""
+    bom = [{"level": level, "material": name, "quantity": qty, "unit_cost": unit, "total_cost": total}
+           for level, name, qty, unit, total in table_rows]
+    yield '{"total": %s, "bom": %s, "wires": [' % (json.dumps(round(grand_total, 2)), json.dumps(bom))
+    for i, r in enumerate(rows):
+        record = r._asdict()
+        record["amperage"] = None if r.amperage != r.amperage else r.amperage  # NaN is not JSON
+        yield ("," if i else "") + "\n" + json.dumps(record)
+    yield "\n]}\n"
+
+
+# === Buffered writers ===
+
+def write_lines(path, lines):
+    """Streams lines to path, newline separated"""
+    with open(path, "w", buffering=BUFFER_SIZE) as f:
+        for i, line in enumerate(lines):
+            if i:
+                f.write("\n")
+            f.write(line)
+
+
+def write_csv(path, records):
+    with open(path, "w", newline="", buffering=BUFFER_SIZE) as f:
+        csv.writer(f).writerows(records)
+
+
+def write_chunks(path, chunks):
+    with open(path, "w", buffering=BUFFER_SIZE) as f:
+        for chunk in chunks:
+            f.write(chunk)
@@ -1,17 +1,21 @@
-import matplotlib.pyplot as plt
-import networkx as nx
+def draw_paths_on_grid(grid, paths_by_room):
+    # Debug plotting only; pyplot is imported on first use to keep it off startup
+    import matplotlib.pyplot as plt
 
-def draw_paths_on_grid(graph, paths_by_room):
-    pos = {node: node for node in graph.nodes()}
+    x0, x1 = grid.x_coords[0], grid.x_coords[-1]
+    y0, y1 = grid.y_coords[0], grid.y_coords[-1]
 
     plt.figure(figsize=(10, 10))
-    nx.draw(graph, pos=pos, node_size=10, node_color="lightgray", edge_color="lightgray")
+    plt.vlines(grid.x_coords, y0, y1, colors="lightgray", linewidth=0.5)
+    plt.hlines(grid.y_coords, x0, x1, colors="lightgray", linewidth=0.5)
+    dots = grid.dot_coords()
+    plt.scatter(dots[:, 0], dots[:, 1], s=10, color="gray")
 
     colors = ["red", "green", "blue", "orange", "purple", "cyan"]
     for i, (room, paths) in enumerate(paths_by_room.items()):
         for path in paths:
-            edges = list(zip(path, path[1:]))
-            nx.draw_networkx_edges(graph, pos, edgelist=edges, width=2, edge_color=colors[i % len(colors)])
+            xs, ys = zip(*path)
+            plt.plot(xs, ys, linewidth=2, color=colors[i % len(colors)])
     
     plt.title("Shortest Paths from Devices to Junction Boxes")
     plt.axis("equal")
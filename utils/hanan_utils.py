@@ -1,4 +1,6 @@
-import networkx as nx
+import numpy as np
+
+from classes.hanan_grid import HananGrid
 
 def cluster_axis(values, threshold):
     """
@@ -41,7 +43,7 @@ def create_axis_mapping(clusters):
 
 def annotations_to_hanan_grid(symbols,scale, threshold=10):
     """
-    Converts a list of Symbol objects into a Hanan grid graph, clustering coordinates,
+    Converts a list of Symbol objects into a Hanan grid, clustering coordinates,
     and updates each symbol's coords to the snapped grid-aligned position.
 
     Args:
@@ -49,7 +51,7 @@ def annotations_to_hanan_grid(symbols,scale, threshold=10):
         threshold (float): clustering threshold for aligning close points
 
     Returns:
-        G (NetworkX Graph): Hanan grid made from snapped coordinates
+        grid (HananGrid): Hanan grid made from snapped coordinates
         x_coords ([int]): Unique snapped x coordinates
         y_coords ([int]): Unique snapped y coordinates
         symbols (List[Symbol]): The same list, with updated .coords
@@ -70,18 +72,41 @@ def annotations_to_hanan_grid(symbols,scale, threshold=10):
         x_raw, y_raw = int(s.coords[0] ), int(s.coords[1])
         s.coords = (x_map[x_raw], y_map[y_raw])
 
-    # Step 4: Extract snapped coordinates for graph
-    snapped_coords = [s.coords for s in symbols]
+    # Step 4: Extract snapped coordinates for grid
+    snapped_coords = set(s.coords for s in symbols)
     x_coords = sorted(set(x_map[x] for x in raw_x))
     y_coords = sorted(set(y_map[y] for y in raw_y))
 
-    # Step 5: Build Hanan grid graph
-    G = nx.grid_2d_graph(len(x_coords), len(y_coords))
-    index_to_coord = {(i, j): (x, y) for i, x in enumerate(x_coords) for j, y in enumerate(y_coords)}
-    G = nx.relabel_nodes(G, index_to_coord)
+    # Step 5: Build implicit Hanan grid and mark points that were originally annotated
+    grid = HananGrid(x_coords, y_coords, dots=snapped_coords)
+
+    return grid, x_coords, y_coords, symbols
+
+
+def snap_to_grid(grid, coords, scale, threshold=10):
+    """
+    Snaps one raw coordinate onto an existing grid axis when one lies within the
+    clustering threshold, so an edited or added symbol can be placed without
+    re-clustering every symbol
+
+    Args:
+        grid(HananGrid): grid built by annotations_to_hanan_grid
+        coords((float,float)): raw symbol coordinates
+        scale(float): ft/pixel scale of the plan
+        threshold(float): clustering threshold used to build the grid
+    Returns:
+        node((int,int)): snapped coordinates, possibly on a new axis value
+    """
+    norm_thresh = threshold*scale
 
-    # Step 6: Mark points that were originally annotated
-    for node in G.nodes():
-        G.nodes[node]['is_dot'] = node in snapped_coords
+    def snap(axis, value):
+        value = int(value)
+        k = int(np.searchsorted(axis, value))
+        nearest = [int(axis[n]) for n in (k - 1, k) if 0 <= n < len(axis)]
+        if nearest:
+            best = min(nearest, key=lambda a: abs(a - value))
+            if abs(best - value) < norm_thresh:
+                return best
+        return value
 
-    return G, x_coords, y_coords, symbols
\ No newline at end of file
+    return snap(grid.x_coords, coords[0]), snap(grid.y_coords, coords[1])
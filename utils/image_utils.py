@@ -0,0 +1,21 @@
+from PIL import Image
+
+
+def decode_image(path):
+    """
+    Fully decodes an image file, including scanned sheets above PIL's
+    decompression bomb limit
+
+    Args:
+        path(str): image file
+    Returns:
+        image(PIL.Image): decoded image
+    """
+    previous = Image.MAX_IMAGE_PIXELS
+    Image.MAX_IMAGE_PIXELS = None  # floor plans are trusted, legitimately huge inputs
+    try:
+        image = Image.open(path)
+        image.load()  # also closes the file
+    finally:
+        Image.MAX_IMAGE_PIXELS = previous
+    return image
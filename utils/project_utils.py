@@ -0,0 +1,127 @@
+import json
+
+from classes.project_archive import ProjectArchive
+from classes.symbol import Symbol
+from classes.symbol_registry import SymbolRegistry
+from utils.hanan_utils import annotations_to_hanan_grid
+
+
+def symbols_from_entries(entries, registry=None):
+    """
+    Builds every symbol of a saved annotation in one pass and links switch
+    controls through the registry's id table afterwards
+
+    Args:
+        entries([dict]): the "symbols" list of an annotation JSON
+        registry(SymbolRegistry): registry to fill, a new one if None
+    Returns:
+        registry(SymbolRegistry): registry holding the loaded symbols
+    """
+    if registry is None:
+        registry = SymbolRegistry()
+    pending = []
+    for entry in entries:
+        symbol = Symbol.from_dict(entry)
+        registry.append(symbol)
+        if symbol.type == "switch" and entry.get("controls"):
+            pending.append((symbol, entry["controls"]))
+
+    # Controls can point at symbols saved after the switch, so link once all exist
+    for switch, control_ids in pending:
+        switch.controls = Symbol.resolve_controls(control_ids, registry)
+    return registry
+
+
+def project_from_dict(raw, registry=None, grid_threshold=None):
+    """
+    Builds a project from the parsed annotation JSON (see load_project)
+
+    Args:
+        raw(dict): {"scale", "symbols", "rooms"} as written by save_project
+        registry(SymbolRegistry): registry to fill, a new one if None
+        grid_threshold(float): when set (and there is a scale), also build the grid
+    Returns:
+        project(dict): {"symbols", "scale", "rooms", "grid"}
+    """
+    symbols = symbols_from_entries(raw.get("symbols", []), registry)
+    scale = raw.get("scale", None)
+    grid = None
+    if grid_threshold is not None and scale is not None and len(symbols):
+        grid, _, _, _ = annotations_to_hanan_grid(symbols, scale, threshold=grid_threshold)
+    rooms = [([tuple(p) for p in room["polygon"]], room["name"]) for room in raw.get("rooms", [])]
+    return {"symbols": symbols, "scale": scale, "rooms": rooms, "grid": grid}
+
+
+def load_project(path, registry=None, grid_threshold=None):
+    """
+    Loads an annotation JSON into a SymbolRegistry, optionally building the
+    Hanan grid in the same step. Project archives (.ewdp, see save_project_archive)
+    are read from their binary columns instead, with their saved grid and routes.
+
+    Args:
+        path(str): annotation JSON written by the symbol or room annotator, or a project archive
+        registry(SymbolRegistry): registry to fill, a new one if None
+        grid_threshold(float): when set (and the file has a scale), snap the
+            symbols and build the grid with this threshold
+    Returns:
+        project(dict): {"symbols", "scale", "rooms", "grid"}; rooms holds the
+            saved (polygon, name) room outlines and grid is None unless built.
+            Archives also carry "routes" (see ProjectArchive.routes)
+    """
+    if path.endswith(ProjectArchive.EXTENSION):
+        project = ProjectArchive(path).project(registry)
+        if project["grid"] is None and grid_threshold is not None and project["scale"] is not None and len(project["symbols"]):
+            project["grid"], _, _, _ = annotations_to_hanan_grid(project["symbols"], project["scale"], threshold=grid_threshold)
+        return project
+    with open(path, "r") as f:
+        raw = json.load(f)
+    return project_from_dict(raw, registry, grid_threshold)
+
+
+def project_to_dict(symbols, scale, rooms=()):
+    """
+    The annotation JSON layout of a project, as written by save_project
+
+    Args:
+        symbols([Symbol]): annotated symbols
+        scale(float): ft/pixel scale of the plan
+        rooms([([(int,int)], str)]): room outlines and names, if already drawn
+    Returns:
+        data(dict): {"scale", "symbols"} plus "rooms" when there are any
+    """
+    data = {
+        "scale": scale,
+        "symbols": [s.to_dict() for s in symbols],
+    }
+    if rooms:
+        data["rooms"] = [{"name": name, "polygon": [list(p) for p in polygon]} for polygon, name in rooms]
+    return data
+
+
+def save_project(path, symbols, scale, rooms=()):
+    """
+    Writes the annotation JSON read by load_project
+
+    Args:
+        path(str): output file
+        symbols([Symbol]): annotated symbols
+        scale(float): ft/pixel scale of the plan
+        rooms([([(int,int)], str)]): room outlines and names, if already drawn
+    """
+    with open(path, "w") as f:
+        json.dump(project_to_dict(symbols, scale, rooms), f, indent=2)
+
+def save_project_archive(path, symbols, scale, rooms=(), grid=None, wiring=None):
+    """
+    Writes a binary project archive (see ProjectArchive), which also keeps the
+    grid and the routed wires so the project reopens and re-costs without routing
+
+    Args:
+        path(str): output file, normally ending in .ewdp
+        symbols([Symbol]): annotated symbols
+        scale(float): ft/pixel scale of the plan
+        rooms([([(int,int)], str)]): room outlines and names
+        grid(HananGrid): grid of the snapped symbols, if built
+        wiring(WiringModel): routed wiring, if built
+    """
+    ProjectArchive.write(path, symbols, scale, rooms, grid, wiring)
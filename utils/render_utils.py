@@ -0,0 +1,216 @@
+import math
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+SCREEN_DPI = 96  # canvas pixels map 1:1 onto an image rendered at this DPI
+
+LINE_COLOR = (128, 128, 128, 255)   # Tk "gray"
+NODE_COLOR = (0, 0, 255, 255)       # Tk "blue"
+OUTLINE_COLOR = (0, 0, 0, 255)
+
+# Drawing style of each wire category; the canvas tags every wire item with style_<name>
+WIRE_STYLES = {
+    'switch_leg': {'color': "blue", 'dash': (2, 4), 'width': 2},     # light -> switch
+    'switch_feed': {'color': "orange", 'dash': (2, 2), 'width': 2},  # switch -> junction box
+    'home_run': {'color': "black", 'dash': None, 'width': 3},        # junction box -> panel
+    'branch': {'color': "red", 'dash': None, 'width': 2},            # any other device wire
+}
+
+
+def _disc_offsets(radius):
+    """Pixel offsets of a filled disc and of its one pixel outline"""
+    r = int(np.ceil(radius)) + 1
+    dy, dx = np.mgrid[-r:r + 1, -r:r + 1]
+    d2 = dx**2 + dy**2
+    fill = d2 <= (radius - 0.5)**2
+    ring = (d2 <= (radius + 0.5)**2) & ~fill
+    return (dx[fill], dy[fill]), (dx[ring], dy[ring])
+
+
+def _stamp(img, px, py, offsets, color):
+    dx, dy = offsets
+    tx = (px[:, None] + dx[None, :]).ravel()
+    ty = (py[:, None] + dy[None, :]).ravel()
+    keep = (tx >= 0) & (tx < img.shape[1]) & (ty >= 0) & (ty < img.shape[0])
+    img[ty[keep], tx[keep]] = color
+
+
+def render_lattice(grid, bbox, node_radius=3, zoom=1.0):
+    """
+    Rasterizes the part of the Hanan grid inside bbox: dashed axis lines and
+    the nodes that are not symbols, drawn the way RoomAnnotator used to draw
+    them as canvas items. Everything else is transparent.
+
+    Args:
+        grid(HananGrid): grid to draw
+        bbox((int,int,int,int)): x0, y0, x1, y1 of the region in canvas pixels
+        node_radius(int): radius of the node markers
+        zoom(float): canvas pixels per plan pixel; markers and dashes keep their size
+    Returns:
+        image(PIL.Image): RGBA image of size (x1 - x0, y1 - y0)
+    """
+    x0, y0, x1, y1 = (int(v) for v in bbox)
+    w, h = max(x1 - x0, 0), max(y1 - y0, 0)
+    img = np.zeros((h, w, 4), dtype=np.uint8)
+    xs = np.rint(grid.x_coords * zoom).astype(np.int64)
+    ys = np.rint(grid.y_coords * zoom).astype(np.int64)
+    if not len(xs) or not len(ys) or not w or not h:
+        return Image.fromarray(img, "RGBA")
+
+    # Axis lines span the grid extent with a 2 on / 2 off dash, like dash=(2, 2)
+    vis_x = xs[(xs >= x0) & (xs < x1)] - x0
+    vis_y = ys[(ys >= y0) & (ys < y1)] - y0
+    rows = np.arange(max(ys[0], y0), min(ys[-1], y1 - 1) + 1)
+    rows = rows[((rows - ys[0]) // 2) % 2 == 0] - y0
+    cols = np.arange(max(xs[0], x0), min(xs[-1], x1 - 1) + 1)
+    cols = cols[((cols - xs[0]) // 2) % 2 == 0] - x0
+    img[np.ix_(rows, vis_x)] = LINE_COLOR
+    img[np.ix_(vis_y, cols)] = LINE_COLOR
+
+    # Nodes whose marker reaches into the region, minus the dots (drawn as canvas items)
+    i = np.flatnonzero((xs >= x0 - node_radius - 1) & (xs < x1 + node_radius + 1))
+    j = np.flatnonzero((ys >= y0 - node_radius - 1) & (ys < y1 + node_radius + 1))
+    ii, jj = np.nonzero(~grid.is_dot[np.ix_(i, j)])
+    px, py = xs[i][ii] - x0, ys[j][jj] - y0
+    fill, ring = _disc_offsets(node_radius)
+    _stamp(img, px, py, ring, OUTLINE_COLOR)
+    _stamp(img, px, py, fill, NODE_COLOR)
+    return Image.fromarray(img, "RGBA")
+
+
+def wire_style(wire):
+    """Name of the WIRE_STYLES entry a wire is drawn with"""
+    start, end = wire.start_symbol.type, wire.end_symbol.type
+    if start == "light" and end == "switch":
+        return 'switch_leg'
+    if start == "switch" and end == "junction box":
+        return 'switch_feed'
+    if start == "junction box" and end == "electrical panel":
+        return 'home_run'
+    return 'branch'
+
+
+def corner_points(path):
+    """
+    Reduces a grid path to the points where it changes direction, dropping
+    repeated and collinear intermediate nodes
+
+    Args:
+        path([(int,int)]): wire path, node by node
+    Returns:
+        corners([(int,int)]): first point, every corner and last point
+    """
+    pts = np.asarray(path, dtype=np.int64).reshape(-1, 2)
+    if len(pts) > 1:
+        moved = np.any(np.diff(pts, axis=0) != 0, axis=1)
+        pts = pts[np.concatenate(([True], moved))]
+    if len(pts) > 2:
+        d = np.diff(pts, axis=0)
+        cross = d[:-1, 0] * d[1:, 1] - d[:-1, 1] * d[1:, 0]
+        backwards = np.sum(d[:-1] * d[1:], axis=1) < 0
+        pts = pts[np.concatenate(([True], (cross != 0) | backwards, [True]))]
+    return [(int(x), int(y)) for x, y in pts]
+
+
+# === Headless layout rendering ===
+
+def _dashed_polyline(draw, points, dash, fill, width):
+    """Draws a polyline with a Tk-style (on, off) dash pattern that carries over corners"""
+    on, off = dash
+    period = on + off
+    start = 0.0  # distance along the polyline where the segment starts
+    for (x1, y1), (x2, y2) in zip(points, points[1:]):
+        length = math.hypot(x2 - x1, y2 - y1)
+        if not length:
+            continue
+        ux, uy = (x2 - x1) / length, (y2 - y1) / length
+        end = start + length
+        # Dash n covers [n * period, n * period + on]; walk whole dash indices, so
+        # fractional dash lengths (dpi scaling) cannot stall on rounding error
+        n = math.floor(start / period)
+        while n * period < end:
+            a, b = max(n * period, start) - start, min(n * period + on, end) - start
+            if b > a:
+                draw.line([(x1 + ux * a, y1 + uy * a), (x1 + ux * b, y1 + uy * b)], fill=fill, width=width)
+            n += 1
+        start = end
+
+
+def _font(size):
+    # Arial as on the canvas, DejaVu on Linux; Pillow's built-in font has no arrow glyph
+    for name in ("arial.ttf", "DejaVuSans.ttf"):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            pass
+    return ImageFont.load_default(size)
+
+
+def draw_symbol(draw, symbol, k=1.0):
+    """Draws a symbol the way WiringVisualizer.draw_symbol does, scaled by k"""
+    x, y = symbol.coords[0] * k, symbol.coords[1] * k
+    if symbol.type == 'junction box':
+        draw.rectangle([x - 8*k, y - 8*k, x + 8*k, y + 8*k], fill="red", outline="black")
+    elif symbol.type == 'electrical panel':
+        draw.rectangle([x - 5*k, y - 15*k, x + 5*k, y + 15*k], fill="black", outline="black")
+    else:
+        draw.ellipse([x - 3*k, y - 3*k, x + 3*k, y + 3*k], fill="red", outline="black")
+
+
+def draw_wire(draw, wire, k=1.0, font=None):
+    """Draws a wire as a polyline through its corners plus its midpoint label, scaled by k"""
+    style = WIRE_STYLES[wire_style(wire)]
+    width = max(1, round(style['width'] * k))
+    corners = [(x * k, y * k) for x, y in corner_points(wire.path)]
+    if len(corners) > 1:
+        if style['dash']:
+            _dashed_polyline(draw, corners, [d * k for d in style['dash']], style['color'], width)
+        else:
+            draw.line(corners, fill=style['color'], width=width, joint="curve")
+
+    path = wire.path
+    if path and font is not None:
+        mx, my = path[len(path) // 2]
+        draw.text((mx * k, (my - 10) * k),
+                  f"{wire.start_symbol.type} → {wire.end_symbol.type} ({wire.gauge})",
+                  fill=style['color'], font=font, anchor="mm")
+
+
+def render_layout(plan, symbols, wires, dpi=SCREEN_DPI, labels=True):
+    """
+    Renders the wiring layout without Tk: the floor plan, the symbols and the
+    wires drawn straight onto a PIL image
+
+    Args:
+        plan(PIL.Image | str): floor plan image or its path
+        symbols([Symbol]): symbols to draw
+        wires([Wire]): wires to draw
+        dpi(int): output resolution; SCREEN_DPI keeps canvas pixels 1:1
+        labels(bool): draw the wire labels
+    Returns:
+        image(PIL.Image): RGB rendering of the layout
+    """
+    if isinstance(plan, str):
+        plan = Image.open(plan)
+    k = dpi / SCREEN_DPI
+    size = (max(1, round(plan.width * k)), max(1, round(plan.height * k)))
+    image = plan.convert("RGB")
+    if size != image.size:
+        image = image.resize(size, Image.Resampling.LANCZOS)
+
+    draw = ImageDraw.Draw(image)
+    font = _font(max(1, round(7 * k * 4 / 3))) if labels else None  # 7pt, as on the canvas
+    # Same stacking as the canvas: symbols first, wires on top
+    for symbol in symbols:
+        draw_symbol(draw, symbol, k)
+    for wire in wires:
+        draw_wire(draw, wire, k, font)
+    return image
+
+
+def export_layout(path, plan, symbols, wires, dpi=SCREEN_DPI, labels=True):
+    """Renders the layout and saves it to path with the DPI recorded in the file"""
+    image = render_layout(plan, symbols, wires, dpi=dpi, labels=labels)
+    image.save(path, dpi=(dpi, dpi))
+    return path
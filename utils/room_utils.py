@@ -0,0 +1,58 @@
+import numpy as np
+
+
+def points_in_polygon(points, polygon, radius=1e-6):
+    """
+    Tests many points against one polygon with a single Path.contains_points
+    call, after discarding the points outside the polygon's bounding box
+
+    Args:
+        points((N,2) array): candidate point coordinates
+        polygon([(int,int)]): polygon vertices
+        radius(float): tolerance passed to Path.contains_points
+    Returns:
+        inside((N,) bool array): True for points inside the polygon
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    inside = np.zeros(len(points), dtype=bool)
+    if not len(points):
+        return inside
+
+    vertices = np.asarray(polygon, dtype=np.float64)
+    low = vertices.min(axis=0) - abs(radius)
+    high = vertices.max(axis=0) + abs(radius)
+    candidates = np.flatnonzero(np.all((points >= low) & (points <= high), axis=1))
+    if len(candidates):
+        from matplotlib.path import Path  # matplotlib is slow to import; only load it once rooms are drawn
+        inside[candidates] = Path(vertices).contains_points(points[candidates], radius=radius)
+    return inside
+
+
+def assign_room(grid, symbols, polygon, room_name):
+    """
+    Assigns room_name to every roomless symbol (except the panel) sitting on a
+    dot inside polygon
+
+    Args:
+        grid(HananGrid): grid whose dots are the snapped symbols
+        symbols(SymbolRegistry): the project's symbols
+        polygon([(int,int)]): room outline
+        room_name(str): name of the room
+    Returns:
+        nodes([(int,int)]): dot nodes inside the polygon
+    """
+    dots = grid.dot_coords()
+    nodes = [(int(x), int(y)) for x, y in dots[points_in_polygon(dots, polygon)]]
+    for node in nodes:
+        for symbol in symbols.at(node):
+            if symbol.type != "electrical panel" and symbol.room is None:
+                symbol.room = room_name
+    return nodes
+
+
+def count_in_polygon(symbols, polygon):
+    """Number of symbols whose coordinates fall inside polygon"""
+    if not symbols:
+        return 0
+    coords = np.array([s.coords for s in symbols], dtype=np.float64)
+    return int(np.count_nonzero(points_in_polygon(coords, polygon)))
@@ -0,0 +1,328 @@
+import heapq
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+class NoPath(Exception):
+    """Raised when a grid node cannot be reached from a tree's root."""
+
+
+def symbol_node(symbol):
+    """
+    Grid node of a (snapped) symbol
+
+    Args:
+        symbol(Symbol): symbol whose coords were snapped by annotations_to_hanan_grid
+    Returns:
+        node((int,int)): pixel tuple of the symbol on the Hanan grid
+    """
+    return (int(symbol.coords[0]), int(symbol.coords[1]))
+
+
+def shortest_path_tree(grid, root, scale=1.0, sources=None):
+    """
+    Builds a single-source shortest path tree from root, with every edge
+    weighted by its wire length (pixel length * scale)
+
+    Args:
+        grid(HananGrid): grid to search
+        root((int,int)): node the tree is rooted at
+        scale(float): ft/pixel scale of the plan
+        sources([(int,int)]): nodes whose paths are needed; the search stops once
+                              all of them are settled. None builds the whole tree
+    Returns:
+        pred(np.ndarray): flat index of every node's parent towards root,
+                          -1 for the root itself and for unreached nodes
+    """
+    pred = np.full(len(grid), -1, dtype=np.int64)
+    dist = [float("inf")] * len(grid)
+    start = grid.flat_index(root)
+    dist[start] = 0.0
+    remaining = None if sources is None else {grid.flat_index(node) for node in sources} - {start}
+    heap = [(0.0, start)]
+    while heap:
+        d, k = heapq.heappop(heap)
+        if d > dist[k]:
+            continue
+        if remaining is not None:
+            remaining.discard(k)
+            if not remaining:
+                break
+        for n, length in grid.flat_edges(k):
+            nd = d + length * scale
+            if nd < dist[n]:
+                dist[n] = nd
+                pred[n] = k
+                heapq.heappush(heap, (nd, n))
+    return pred
+
+
+def astar_path(grid, source, target, scale=1.0):
+    """
+    Shortest (wire length) path between two nodes using A* with a rectilinear
+    distance heuristic, which is exact on an unobstructed Hanan grid
+
+    Args:
+        grid(HananGrid): grid to search
+        source((int,int)): start node
+        target((int,int)): end node
+        scale(float): ft/pixel scale of the plan
+    Returns:
+        path([(int,int)]): grid nodes from source to target
+    Raises:
+        NoPath: if target is not reachable from source
+    """
+    tx, ty = target
+    x_coords, y_coords = grid.x_coords, grid.y_coords
+    n_y = len(y_coords)
+
+    def heuristic(k):
+        i, j = divmod(k, n_y)
+        return (abs(int(x_coords[i]) - tx) + abs(int(y_coords[j]) - ty)) * scale
+
+    start, goal = grid.flat_index(source), grid.flat_index(target)
+    pred = {start: -1}
+    dist = {start: 0.0}
+    # Ties on f are broken towards the smaller heuristic (deeper nodes) to expand fewer nodes
+    h = heuristic(start)
+    heap = [(h, h, start)]
+    while heap:
+        _, _, k = heapq.heappop(heap)
+        if k == goal:
+            path = []
+            while k != -1:
+                path.append(grid.node_from_flat(k))
+                k = pred[k]
+            return path[::-1]
+        d = dist[k]
+        for n, length in grid.flat_edges(k):
+            nd = d + length * scale
+            if nd < dist.get(n, float("inf")):
+                dist[n] = nd
+                pred[n] = k
+                h = heuristic(n)
+                heapq.heappush(heap, (nd + h, h, n))
+    raise NoPath(f"{target} is not reachable from {source}")
+
+
+def tree_path(grid, pred, root, node):
+    """
+    Reads the path from node back to the root of a shortest path tree
+
+    Args:
+        grid(HananGrid): grid the tree was built on
+        pred(np.ndarray): predecessor array returned by shortest_path_tree
+        root((int,int)): root of the tree
+        node((int,int)): start of the path
+    Returns:
+        path([(int,int)]): grid nodes from node to root
+    Raises:
+        NoPath: if node is not reachable from root
+    """
+    root_k = grid.flat_index(root)
+    k = grid.flat_index(node)
+    path = [grid.node_from_flat(k)]
+    while k != root_k:
+        k = pred[k]
+        if k < 0:
+            raise NoPath(f"{node} is not reachable from {root}")
+        path.append(grid.node_from_flat(k))
+    return path
+
+
+def rectilinear_mst(points):
+    """
+    Rectilinear (Manhattan) minimum spanning tree rooted at points[0], grown
+    with Prim's algorithm. Each step updates the distances of every point in
+    one vectorized pass, so the Python work stays linear in the number of points.
+
+    Args:
+        points([(int,int)]): terminals of the tree, root first
+    Returns:
+        parent([int]): index of each point's parent, -1 for the root
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    n = len(pts)
+    parent = np.full(n, -1, dtype=np.int64)
+    in_tree = np.zeros(n, dtype=bool)
+    in_tree[0] = True
+    best = np.abs(pts - pts[0]).sum(axis=1)
+    best_from = np.zeros(n, dtype=np.int64)
+    best[0] = np.inf
+    for _ in range(n - 1):
+        k = int(np.argmin(best))
+        parent[k] = best_from[k]
+        in_tree[k] = True
+        best[k] = np.inf
+        d = np.abs(pts - pts[k]).sum(axis=1)
+        closer = (d < best) & ~in_tree
+        best[closer] = d[closer]
+        best_from[closer] = k
+    return parent.tolist()
+
+
+def daisy_chain(junction, devices):
+    """
+    Wire requests for a room whose outlets and switches are daisy-chained along
+    a rectilinear spanning tree rooted at the junction box, instead of each one
+    running its own wire back to it. Lights are still wired to their switch.
+
+    Args:
+        junction(Symbol): the room's junction box
+        devices([Symbol]): every symbol in the room
+    Returns:
+        requests([(Symbol, Symbol)]): (start symbol, end symbol) per wire
+    """
+    # Prim breaks ties by input order; sorting makes the chain independent of room assignment order
+    feeders = sorted((d for d in devices if d is not junction and d.type != "light"),
+                     key=lambda d: (symbol_node(d), str(d.id)))
+    parent = rectilinear_mst([symbol_node(junction)] + [symbol_node(d) for d in feeders])
+    chain = [junction] + feeders
+
+    requests = []
+    for k, device in enumerate(feeders, start=1):
+        if device.type == "switch":
+            for light in device.controls:
+                requests.append((light, device))
+        requests.append((device, chain[parent[k]]))
+    return requests
+
+
+def downstream_loads(requests):
+    """
+    Amperage carried by each wire of a room: its start device plus every device
+    wired (directly or through a chain) into that start device. Shared loads get
+    the same 30% demand factor, capped at 20A, used for junction boxes.
+
+    Args:
+        requests([(Symbol, Symbol)]): (start symbol, end symbol) per wire
+    Returns:
+        loads({Symbol: float}): amps carried by the wire leaving each start symbol
+    """
+    children = defaultdict(list)
+    for start, end in requests:
+        children[end].append(start)
+
+    loads = {}
+    for start, _ in requests:
+        stack = [start]
+        while stack:
+            s = stack[-1]
+            pending = [c for c in children[s] if c not in loads]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            if s not in loads:
+                loads[s] = (s.amperage or 0) + sum(loads[c] for c in children[s])
+    return {s: max(s.amperage or 0, min(total * 0.3, 20)) for s, total in loads.items()}
+
+
+def staircase_path(grid, source, target):
+    """
+    Closed-form shortest path on an unobstructed Hanan grid: every monotone
+    staircase is shortest, so take the L that runs along the source's row to
+    the target's column and then along that column. Axis indices are found by
+    binary search on the sorted axes.
+
+    Args:
+        grid(HananGrid): grid without blocked edges
+        source((int,int)): start node
+        target((int,int)): end node
+    Returns:
+        path([(int,int)]): grid nodes from source to target
+    """
+    (i0, j0), (i1, j1) = grid.index_of(source), grid.index_of(target)
+    step_i = 1 if i1 >= i0 else -1
+    step_j = 1 if j1 >= j0 else -1
+    y0, x1 = source[1], target[0]
+    path = [(int(grid.x_coords[i]), y0) for i in range(i0, i1 + step_i, step_i)]
+    path.extend((x1, int(grid.y_coords[j])) for j in range(j0 + step_j, j1 + step_j, step_j))
+    return path
+
+
+def route_to_targets(grid, pairs, scale=1.0, mode="graph", roots=()):
+    """
+    Routes many (source, target) pairs. Targets in roots (junction boxes and
+    the panel) shared by several pairs get one shortest path tree, grown only
+    until every source is settled, and every path to them is read out of it;
+    the remaining pairs (light -> switch legs, daisy chain links) are searched
+    individually with A*.
+
+    In "direct" mode every path is built in closed form with staircase_path;
+    the graph search is only used when the grid has blocked edges.
+
+    Args:
+        grid(HananGrid): grid to route on
+        pairs([((int,int),(int,int))]): (source node, target node) per wire
+        scale(float): ft/pixel scale used to weight edges
+        mode(str): "graph" or "direct"
+        roots({(int,int)}): target nodes worth a shortest path tree
+    Returns:
+        paths([[(int,int)] | None]): source -> target path per pair, in input
+                                     order, None where no path exists
+    """
+    if mode == "direct" and not grid.has_obstacles:
+        return [staircase_path(grid, source, target) for source, target in pairs]
+
+    by_target = defaultdict(list)
+    for idx, (_, target) in enumerate(pairs):
+        by_target[target].append(idx)
+
+    paths = [None] * len(pairs)
+    for target, indices in by_target.items():
+        if len(indices) == 1 or target not in roots:
+            for idx in indices:
+                try:
+                    paths[idx] = astar_path(grid, pairs[idx][0], target, scale)
+                except NoPath:
+                    pass
+            continue
+
+        pred = shortest_path_tree(grid, target, scale, sources=[pairs[idx][0] for idx in indices])
+        for idx in indices:
+            try:
+                paths[idx] = tree_path(grid, pred, target, pairs[idx][0])
+            except NoPath:
+                pass
+    return paths
+
+
+# Grid shared by every job of a worker process, installed once by the pool initializer
+_worker_grid = None
+
+
+def _init_worker(grid):
+    global _worker_grid
+    _worker_grid = grid
+
+
+def _route_job(pairs, scale, mode, roots):
+    return route_to_targets(_worker_grid, pairs, scale, mode, roots)
+
+
+def route_rooms(grid, pairs_by_room, scale=1.0, mode="graph", workers=0, roots=()):
+    """
+    Routes every room independently. Each room only needs the read-only grid
+    and its own pairs, so with workers > 0 the rooms are sent as jobs to a
+    process pool; the grid is pickled once per worker, not once per job.
+
+    Args:
+        grid(HananGrid): grid to route on
+        pairs_by_room({str: [((int,int),(int,int))]}): (source, target) pairs per room
+        scale(float): ft/pixel scale used to weight edges
+        mode(str): "graph" or "direct", see route_to_targets
+        workers(int): size of the process pool, 0 to route in this process
+        roots({(int,int)}): target nodes worth a shortest path tree, see route_to_targets
+    Returns:
+        paths_by_room({str: [[(int,int)] | None]}): paths per room, in the
+                                                    order of pairs_by_room
+    """
+    if workers <= 0 or len(pairs_by_room) < 2:
+        return {room: route_to_targets(grid, pairs, scale, mode, roots) for room, pairs in pairs_by_room.items()}
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(grid,)) as pool:
+        futures = {room: pool.submit(_route_job, pairs, scale, mode, roots) for room, pairs in pairs_by_room.items()}
+        return {room: future.result() for room, future in futures.items()}